@@ -22,6 +22,7 @@ class EvalContextTest(unittest.TestCase):
         self.assertEqual(ctx.seen, [])
         self.assertIsInstance(ctx.namespace, dict)
         self.assertEqual(ctx.ref, 'A1')
+        self.assertIsNone(ctx.evaluator)
 
     def test_eval_cell(self):
         ctx = ast_nodes.EvalContext(ref='A1')
@@ -100,6 +101,15 @@ class OperandNodeTest(unittest.TestCase):
         self.assertIsInstance(
             node.eval(context('A1')), xlerrors.ExcelError)
 
+    def test_compile(self):
+        node = self.create_node()
+        self.assertEqual(node.compile()(context('A1')), 1)
+
+    def test_compile_error(self):
+        node = self.create_node('#VALUE!', 'error')
+        self.assertIsInstance(
+            node.compile()(context('A1')), xlerrors.ValueExcelError)
+
     def test_str(self):
         node = self.create_node()
         self.assertEqual(str(node), '1')
@@ -153,6 +163,10 @@ class RangeNodeTest(unittest.TestCase):
         node = self.create_node('A1')
         self.assertEqual(node.eval(context('Sh1!C1', self.model)), 0)
 
+    def test_compile(self):
+        node = self.create_node('A1')
+        self.assertEqual(node.compile()(context('Sh1!C1', self.model)), 0)
+
     def test_str(self):
         node = self.create_node('A1:B2')
         self.assertEqual(str(node), 'A1:B2')
@@ -193,6 +207,29 @@ class OperatorNodeTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             node.eval(context('A1'))
 
+    def test_compile(self):
+        node = self.create_node()
+        self.assertEqual(node.compile()(context('A1')), 3)
+
+    def test_compile_prefix(self):
+        node = ast_nodes.OperatorNode(
+            f_token(tvalue='-', ttype='operator-prefix', tsubtype='math'))
+        node.right = self.create_node()
+        self.assertEqual(node.compile()(context('A1')), -3)
+
+    def test_compile_postfix(self):
+        node = ast_nodes.OperatorNode(
+            f_token(tvalue='%', ttype='operator-postfix', tsubtype='math'))
+        node.left = self.create_node()
+        self.assertEqual(node.compile()(context('A1')), 0.03)
+
+    def test_compile_unknown_type(self):
+        node = ast_nodes.OperatorNode(
+            f_token(tvalue='-', ttype='operator', tsubtype='math'))
+        compiled = node.compile()
+        with self.assertRaises(ValueError):
+            compiled(context('A1'))
+
     def test_str(self):
         node = self.create_node()
         self.assertEqual(str(node), '(1) + (2)')
@@ -5,7 +5,9 @@ Este test define el comportamiento esperado del nuevo CellReference
 que debe reemplazar las tuplas (sheet, address) en todo el código.
 """
 import unittest
-from xlcalculator.range import CellReference
+from xlcalculator.range import (
+    CellReference, ParsedAddress, column_index,
+    is_full_column_or_row_reference, is_full_range, resolve_ranges)
 
 
 class CellReferenceTest(unittest.TestCase):
@@ -66,6 +68,14 @@ class CellReferenceTest(unittest.TestCase):
         with self.assertRaises(AttributeError):
             ref.address = 'B1'
 
+    def test_parse_is_shared(self):
+        """Test that parsing the same reference again reuses the result."""
+        ref1 = CellReference.parse("'My Sheet'!A1", current_sheet='Sheet2')
+        ref2 = CellReference.parse("'My Sheet'!A1", current_sheet='Sheet2')
+
+        self.assertIs(ref1, ref2)
+        self.assertEqual(ref1.sheet, 'My Sheet')
+
     def test_equality(self):
         """Test equality comparison between CellReference objects."""
         ref1 = CellReference.parse('Sheet1!A1', current_sheet='Sheet2')
@@ -76,5 +86,99 @@ class CellReferenceTest(unittest.TestCase):
         self.assertNotEqual(ref1, ref3)  # Different explicit vs implicit
 
 
+class ParsedAddressTest(unittest.TestCase):
+    """Tests for ParsedAddress.parse."""
+
+    def test_parse_plain_address(self):
+        """Test parsing plain addresses like 'Sheet1!AB12'."""
+        parsed = ParsedAddress.parse('Sheet1!AB12')
+
+        self.assertEqual(parsed.sheet, 'Sheet1')
+        self.assertEqual(parsed.column, 'AB')
+        self.assertEqual(parsed.row, 12)
+
+    def test_parse_leading_zero_row(self):
+        """Test that row digits may start with 0, as in 'Sheet1!A01'."""
+        parsed = ParsedAddress.parse('Sheet1!A01')
+
+        self.assertEqual(parsed.column, 'A')
+        self.assertEqual(parsed.row, 1)
+
+    def test_parse_row_zero(self):
+        """Test that row 0 is parsed as is, plain or absolute."""
+        for addr in ('Sheet1!A0', 'Sheet1!$A$0'):
+            parsed = ParsedAddress.parse(addr)
+            self.assertEqual(parsed.column, 'A')
+            self.assertEqual(parsed.row, 0)
+
+    def test_parse_absolute_address(self):
+        """Test parsing absolute addresses like 'Sheet1!$B$7'."""
+        parsed = ParsedAddress.parse('Sheet1!$B$7')
+
+        self.assertEqual(parsed.column, 'B')
+        self.assertEqual(parsed.row, 7)
+
+    def test_parse_invalid_address(self):
+        """Test that invalid addresses are rejected."""
+        with self.assertRaises(ValueError):
+            ParsedAddress.parse('Sheet1!ABCD1')
+
+
+class ResolveRangesTest(unittest.TestCase):
+    """Tests for resolve_ranges."""
+
+    def test_row_zero(self):
+        """Test that row 0 bounds are left to the general parser."""
+        self.assertEqual(
+            ('Sheet1', [['Sheet1!A1', 'Sheet1!B1']]),
+            resolve_ranges('A0:B1'))
+
+
+class FullColumnOrRowReferenceTest(unittest.TestCase):
+    """Tests for is_full_column_or_row_reference."""
+
+    def test_full_references(self):
+        """Test full column and row references, with or without sheet."""
+        for ref in ('A:A', 'A:B', 'Sheet1!XFD:XFD', '1:1', 'Sheet 1!2:10'):
+            self.assertTrue(is_full_column_or_row_reference(ref), ref)
+
+    def test_other_references(self):
+        """Test that cells, ranges and malformed references are rejected."""
+        for ref in ('A1', 'A1:B2', 'Sheet1!A1:B2', 'a:a', 'A:1', 'A:',
+                    ':A', 'A:B:C', 'Sheet1!A', '!A:A',
+                    'Sheet1!A1,Sheet1!B:B'):
+            self.assertFalse(is_full_column_or_row_reference(ref), ref)
+
+
+class IsFullRangeTest(unittest.TestCase):
+    """Tests for is_full_range."""
+
+    def test_single_column_or_row(self):
+        """Test single full column and row references."""
+        for ref in ('A:A', 'Sheet1!a:a', 'Sheet1!XFD:XFD', '1:1'):
+            self.assertTrue(is_full_range(ref), ref)
+
+    def test_other_references(self):
+        """Test that other references are not full ranges."""
+        for ref in ('A:B', '1:2', 'A1:B2', 'A1', 'AAAA:AAAA', '$A:$A',
+                    'Sheet1!A1,Sheet1!B:B'):
+            self.assertFalse(is_full_range(ref), ref)
+
+
+class ColumnIndexTest(unittest.TestCase):
+    """Tests for column_index."""
+
+    def test_column_index(self):
+        """Test conversion of column letters to 1-based numbers."""
+        self.assertEqual(column_index('A'), 1)
+        self.assertEqual(column_index('AB'), 28)
+        self.assertEqual(column_index('xfd'), 16384)
+
+    def test_invalid_column(self):
+        """Test that invalid column letters are rejected."""
+        with self.assertRaises(ValueError):
+            column_index('XFE1')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
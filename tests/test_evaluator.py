@@ -1,6 +1,10 @@
+import gc
+import mock
 import unittest
+import weakref
 
 from xlcalculator import evaluator, model
+from xlcalculator.xltypes import XLCell
 from . import testing
 
 
@@ -41,6 +45,20 @@ class TestEvaluator(unittest.TestCase):
         result_07 = 102
         self.assertEqual(result_07, evaluated_result_07)
 
+    def test_resolve_names(self):
+        self.assertEqual('Eighth!B1', self.evaluator.resolve_names('Hundred'))
+        self.assertEqual('First!A2', self.evaluator.resolve_names('First!A2'))
+
+    def test_resolve_names_added_later(self):
+        self.assertEqual('Later', self.evaluator.resolve_names('Later'))
+        self.evaluator.model.defined_names['Later'] = \
+            self.evaluator.model.cells['First!A2']
+        self.assertEqual('First!A2', self.evaluator.resolve_names('Later'))
+
+    def test_resolve_names_range(self):
+        with self.assertRaises(ValueError):
+            self.evaluator.resolve_names('My_Range')
+
     def test_set_value(self):
         self.evaluator.set_cell_value('First!A2', 88)
         evaluated_result_00 = self.evaluator.model.cells['First!A2'].value
@@ -128,3 +146,220 @@ class TestEvaluator(unittest.TestCase):
         excel_value_03 = add_evaluator.get_cell_value('Sheet1!D1')
         value_03 = add_evaluator.evaluate('Sheet1!D1')
         self.assertEqual(excel_value_03, value_03)
+
+    def test_get_range_values(self):
+        range_compiler = model.ModelCompiler()
+        range_model = range_compiler.read_and_parse_dict({
+            'Y1': 1, 'Z1': 2, 'AA1': 3,
+            'Y2': 4, 'Z2': 5, 'AA2': 6,
+        })
+        range_evaluator = evaluator.Evaluator(range_model)
+
+        self.assertEqual(
+            [[1, 2, 3], [4, 5, 6]],
+            range_evaluator.get_range_values('Sheet1!Y1:AA2'))
+        self.assertEqual(
+            [[2, 3]], range_evaluator.get_range_values('Sheet1!$Z$1:$AA$1'))
+
+    def test_get_range_values_full_column_and_row(self):
+        range_compiler = model.ModelCompiler()
+        range_model = range_compiler.read_and_parse_dict({
+            'B1': 1, 'A1': 2, 'A3': 3, 'A11': 4,
+        })
+        range_evaluator = evaluator.Evaluator(range_model)
+
+        self.assertEqual(
+            [[2], [3], [4]], range_evaluator.get_range_values('Sheet1!A:A'))
+        # Row 11 is not part of row 1.
+        self.assertEqual(
+            [[2, 1]], range_evaluator.get_range_values('Sheet1!1:1'))
+
+    def test_get_range_values_after_changes(self):
+        range_compiler = model.ModelCompiler()
+        range_model = range_compiler.read_and_parse_dict({
+            'A1': 1, 'B1': 2, 'A2': 3,
+        })
+        range_evaluator = evaluator.Evaluator(range_model)
+        self.assertEqual(
+            [[1, 2], [3, 0]], range_evaluator.get_range_values('Sheet1!A1:B2'))
+        self.assertEqual(
+            [[1], [3]], range_evaluator.get_range_values('Sheet1!A:A'))
+
+        range_model.cells['Sheet1!A1'].value = 5
+        range_evaluator.set_cell_value('Sheet1!B2', 4)
+        range_evaluator.set_cell_value('Sheet1!A3', 6)
+        self.assertEqual(
+            [[5, 2], [3, 4]], range_evaluator.get_range_values('Sheet1!A1:B2'))
+        self.assertEqual(
+            [[5], [3], [6]], range_evaluator.get_range_values('Sheet1!A:A'))
+
+        # Direct edits that keep the number of cells are picked up too.
+        del range_model.cells['Sheet1!A2']
+        range_model.cells['Sheet1!A4'] = XLCell('Sheet1!A4', 7)
+        self.assertEqual(
+            [[5], [6], [7]], range_evaluator.get_range_values('Sheet1!A:A'))
+        self.assertEqual(
+            [[5, 2], [0, 4]], range_evaluator.get_range_values('Sheet1!A1:B2'))
+
+    def test_get_range_values_invalid(self):
+        with self.assertRaises(ValueError):
+            self.evaluator.get_range_values('Sheet1!A:B1')
+
+    def test_evaluate_recompiles_changed_formula(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict(
+            {'A1': 2, 'B1': '=A1*3'})
+        calc_evaluator = evaluator.Evaluator(calc_model)
+        self.assertEqual(6, calc_evaluator.evaluate('Sheet1!B1'))
+
+        calc_model.cells['Sheet1!B1'].formula.formula = '=A1+3'
+        calc_model.build_code()
+        self.assertEqual(5, calc_evaluator.evaluate('Sheet1!B1'))
+
+    def test_evaluate_parses_formula_on_demand(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict(
+            {'A1': 2, 'B1': '=A1*3', 'C1': '=B1+1'}, build_code=False)
+        self.assertIsNone(calc_model.cells['Sheet1!B1'].formula.ast)
+
+        calc_evaluator = evaluator.Evaluator(calc_model)
+        self.assertEqual(7, calc_evaluator.evaluate('Sheet1!C1'))
+        self.assertIsNotNone(calc_model.cells['Sheet1!B1'].formula.ast)
+
+    def test_evaluate_parse_error_on_demand(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict(
+            {'A1': 1, 'A2': 2, 'B1': '=A1 A2'}, build_code=False)
+        calc_evaluator = evaluator.Evaluator(calc_model)
+        with self.assertRaisesRegex(
+                RuntimeError, 'Problem evaluating cell Sheet1!B1'):
+            calc_evaluator.evaluate('Sheet1!B1')
+
+    def test_evaluate_all(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict({
+            'A1': 2,
+            'B1': '=A1*3',
+            'B2': '=A1+1',
+            'C1': '=B1+B2',
+        })
+
+        expected = {'Sheet1!B1': 6, 'Sheet1!B2': 3, 'Sheet1!C1': 9}
+        self.assertEqual(
+            expected, evaluator.Evaluator(calc_model).evaluate_all())
+        self.assertEqual(
+            expected,
+            evaluator.Evaluator(calc_model).evaluate_all(max_workers=2))
+
+    def test_evaluate_all_reads_finished_cells(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict({
+            'A1': '=RAND()',
+            'B1': '=A1+0',
+            'B2': '=A1+0',
+        })
+
+        # Cells of earlier levels are not evaluated again by dependents.
+        values = evaluator.Evaluator(calc_model).evaluate_all(max_workers=2)
+        self.assertEqual(values['Sheet1!A1'], values['Sheet1!B1'])
+        self.assertEqual(values['Sheet1!A1'], values['Sheet1!B2'])
+
+    def test_evaluate_memo(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict({
+            'A1': 2,
+            'B1': '=A1*3',
+            'C1': '=NOW()',
+        })
+        calc_evaluator = evaluator.Evaluator(calc_model)
+
+        self.assertEqual(6, calc_evaluator.evaluate('Sheet1!B1'))
+        self.assertIn('Sheet1!B1', calc_evaluator._memo)
+        calc_evaluator.evaluate('Sheet1!C1')
+        self.assertNotIn('Sheet1!C1', calc_evaluator._memo)
+
+        # Setting a value invalidates the memoized formulas.
+        calc_evaluator.set_cell_value('Sheet1!A1', 4)
+        self.assertEqual(12, calc_evaluator.evaluate('Sheet1!B1'))
+
+        # So does setting it on the model.
+        calc_model.set_cell_value('Sheet1!A1', 5)
+        self.assertEqual(15, calc_evaluator.evaluate('Sheet1!B1'))
+
+        # Direct cell edits are picked up as well.
+        calc_model.cells['Sheet1!A1'].value = 6
+        self.assertEqual(18, calc_evaluator.evaluate('Sheet1!B1'))
+        self.assertEqual(18, calc_evaluator.evaluate('Sheet1!B1'))
+
+    def test_evaluate_memo_chain(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict({
+            'A1': 2,
+            'B1': '=A1*3',
+            'C1': '=B1+1',
+        })
+        calc_evaluator = evaluator.Evaluator(calc_model)
+        self.assertEqual(7, calc_evaluator.evaluate('Sheet1!C1'))
+
+        calc_model.cells['Sheet1!A1'].value = 5
+        self.assertEqual(16, calc_evaluator.evaluate('Sheet1!C1'))
+
+        del calc_model.cells['Sheet1!A1']
+        self.assertEqual(1, calc_evaluator.evaluate('Sheet1!C1'))
+
+    def test_evaluate_memo_diamond_chain(self):
+        cells = {'A1': 1, 'B1': 2}
+        for row in range(2, 23):
+            cells[f'A{row}'] = f'=A{row - 1}+B{row - 1}'
+            cells[f'B{row}'] = f'=A{row - 1}-B{row - 1}'
+        calc_model = model.ModelCompiler().read_and_parse_dict(cells)
+        calc_evaluator = evaluator.Evaluator(calc_model)
+        value = calc_evaluator.evaluate('Sheet1!A22')
+
+        # Every cell is checked once, not once per path leading to it.
+        with mock.patch.object(
+                calc_evaluator, '_evaluate',
+                wraps=calc_evaluator._evaluate) as evaluate:
+            self.assertEqual(value, calc_evaluator.evaluate('Sheet1!A22'))
+        self.assertLess(evaluate.call_count, 2 * len(cells))
+
+        calc_model.cells['Sheet1!A1'].value = 3
+        self.assertNotEqual(value, calc_evaluator.evaluate('Sheet1!A22'))
+
+    def test_evaluate_compile_error(self):
+        calc_compiler = model.ModelCompiler()
+        calc_model = calc_compiler.read_and_parse_dict(
+            {'A1': 1, 'A2': 2, 'B1': '=A1 A2'})
+        calc_evaluator = evaluator.Evaluator(calc_model)
+        with self.assertRaisesRegex(
+                RuntimeError, 'Problem evaluating cell Sheet1!B1'):
+            calc_evaluator.evaluate('Sheet1!B1')
+
+    def test_clear_context_cache(self):
+        # Kept for backward compatibility, there is no cache left to clear.
+        self.evaluator.clear_context_cache()
+        self.assertEqual(0.1, self.evaluator.evaluate('First!A2'))
+
+    def test_eval_cell_cache(self):
+        context = evaluator.EvaluatorContext(self.evaluator, 'First!A2')
+        self.assertEqual(0.1, context.eval_cell('First!A2'))
+        # A second lookup is served from the context, not the model.
+        self.evaluator.set_cell_value('First!A2', 88)
+        self.assertEqual(0.1, context.eval_cell('First!A2'))
+        self.evaluator.set_cell_value('First!A2', 0.1)
+
+        # The cache lives on the context and dies with it.
+        context_ref = weakref.ref(context)
+        del context
+        gc.collect()
+        self.assertIsNone(context_ref())
+
+    def test_eval_cell_cycle(self):
+        context = evaluator.EvaluatorContext(self.evaluator, 'First!A2')
+        with mock.patch.object(
+                self.evaluator, 'evaluate', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                context.eval_cell('First!A3')
+        # The failed cell was not cached, so a second visit is a cycle.
+        with self.assertRaisesRegex(RuntimeError, 'Cycle detected'):
+            context.eval_cell('First!A3')
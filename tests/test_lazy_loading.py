@@ -0,0 +1,71 @@
+import unittest
+
+from xlcalculator import lazy_loading
+from xlcalculator.model import ModelCompiler
+from xlcalculator.xltypes import XLCell, XLRange
+
+
+class ExcelCompliantLazyRangeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = ModelCompiler().read_and_parse_dict({
+            'A1': 1, 'A2': 2, 'A4': 4,
+            'B1': 'x', 'Z1': 3, 'AB1': 5,
+        })
+
+    def test_full_column_cells(self):
+        lazy_range = lazy_loading.ExcelCompliantLazyRange(
+            'Sheet1!A:A', self.model)
+        self.assertEqual(
+            [['Sheet1!A1'], ['Sheet1!A2'], ['Sheet1!A3'], ['Sheet1!A4']],
+            lazy_range.cells)
+
+    def test_full_row_cells(self):
+        lazy_range = lazy_loading.ExcelCompliantLazyRange(
+            'Sheet1!1:1', self.model)
+        self.assertEqual(28, len(lazy_range.cells[0]))
+        self.assertEqual('Sheet1!A1', lazy_range.cells[0][0])
+        self.assertEqual('Sheet1!Z1', lazy_range.cells[0][25])
+        self.assertEqual('Sheet1!AB1', lazy_range.cells[0][27])
+
+    def test_cells_rebuilt_after_set_cell_value(self):
+        lazy_range = lazy_loading.ExcelCompliantLazyRange(
+            'Sheet1!A:A', self.model)
+        cells = lazy_range.cells
+        self.assertIs(cells, lazy_range.cells)
+
+        self.model.set_cell_value('Sheet1!A6', 6)
+        self.assertEqual(6, len(lazy_range.cells))
+
+    def test_cells_rebuilt_after_cell_added_directly(self):
+        lazy_range = lazy_loading.ExcelCompliantLazyRange(
+            'Sheet1!A:A', self.model)
+        self.assertEqual(4, len(lazy_range.cells))
+
+        self.model.cells['Sheet1!A7'] = XLCell('Sheet1!A7', value=7)
+        self.assertEqual(7, len(lazy_range.cells))
+
+        # Edits that keep the number of cells need the index cleared.
+        del self.model.cells['Sheet1!A7']
+        self.model.cells['Sheet1!A8'] = XLCell('Sheet1!A8', value=8)
+        self.model.clear_cell_index()
+        self.assertEqual(8, len(lazy_range.cells))
+
+    def test_empty_column_cells(self):
+        lazy_range = lazy_loading.ExcelCompliantLazyRange(
+            'Sheet1!C:C', self.model)
+        self.assertEqual([[]], lazy_range.cells)
+        self.assertEqual(
+            [[]],
+            lazy_loading.ExcelCompliantLazyRange(
+                'Sheet1!20:20', self.model).cells)
+
+    def test_create_excel_compliant_lazy_range(self):
+        self.assertIsInstance(
+            lazy_loading.create_excel_compliant_lazy_range(
+                'Sheet1!A:A', self.model),
+            lazy_loading.ExcelCompliantLazyRange)
+        self.assertIsInstance(
+            lazy_loading.create_excel_compliant_lazy_range(
+                'Sheet1!A1:B2', self.model),
+            XLRange)
@@ -1,9 +1,13 @@
 
+import mock
+import os
+import tempfile
 import unittest
 from copy import deepcopy
 
 from jsonpickle import decode
 
+from xlcalculator import model as model_module
 from xlcalculator.model import Model, ModelCompiler
 from xlcalculator.xltypes import XLCell, XLFormula, XLRange
 from xlcalculator.tokenizer import f_token
@@ -44,6 +48,34 @@ class ModelTest(testing.XlCalculatorTestCase):
 
         self.assertEqual(self.model, this_model)
 
+    def test_eq(self):
+        this_model = deepcopy(self.model)
+        self.assertEqual(self.model, this_model)
+
+        del this_model.cells['First!A2']
+        self.assertNotEqual(self.model, this_model)
+        self.assertNotEqual(this_model, self.model)
+
+        that_model = deepcopy(self.model)
+        del that_model.defined_names['Hundred']
+        self.assertNotEqual(self.model, that_model)
+        self.assertNotEqual(that_model, self.model)
+
+    def test_persist_and_construct_from_json_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for fname in ('model.json', 'model.json.gz'):
+                path = os.path.join(tmp_dir, fname)
+                # Small chunks exercise the chunked writes.
+                with mock.patch.object(model_module, '_WRITE_CHUNK_SIZE', 100):
+                    self.model.persist_to_json_file(path)
+
+                new_model = Model()
+                new_model.construct_from_json_file(path)
+                self.assertEqual(self.model, new_model)
+                self.assertEqual(
+                    self.model.cells['First!A2'].value,
+                    new_model.cells['First!A2'].value)
+
     def test_set_value(self):
         this_model = deepcopy(self.model)
 
@@ -238,6 +270,14 @@ class ModelCompilerTest(unittest.TestCase):
             reference_model.defined_names,
             extracted_model.defined_names)
 
+        # The extracted cells don't share anything the new model changes.
+        extracted_cell = extracted_model.cells['Fourth!A2']
+        reader_cell = reader_model.cells['Fourth!A2']
+        self.assertIsNot(reader_cell, extracted_cell)
+        self.assertIsNot(reader_cell.formula, extracted_cell.formula)
+        self.assertIsNot(
+            reader_cell.defined_names, extracted_cell.defined_names)
+
     def test_extract_and_evaluate(self):
         model_compiler = ModelCompiler()
         reader_model = model_compiler.read_and_parse_archive(
@@ -280,3 +320,112 @@ class ModelCompilerTest(unittest.TestCase):
         evaluator.set_cell_value("Sheet1!B22", 100)
         self.assertEqual(0.4, evaluator.evaluate("Sheet1!B28"))
         self.assertEqual(1066.4, evaluator.evaluate("Sheet1!C22"))
+
+    def test_build_ranges_shared_range(self):
+        input_dict = {
+            "A1": 1,
+            "A2": 2,
+            "B1": "=SUM(A1:A3)",
+            "B2": "=AVERAGE(A1:A3)",
+        }
+
+        model_compiler = ModelCompiler()
+        my_model = model_compiler.read_and_parse_dict(input_dict)
+
+        self.assertEqual(['Sheet1!A1:A3'], list(my_model.ranges))
+        # The missing cell of the shared range is created exactly once.
+        self.assertEqual('', my_model.cells['Sheet1!A3'].value)
+        self.assertEqual(
+            {'Sheet1!A1', 'Sheet1!A2', 'Sheet1!A3'},
+            my_model.formulae['Sheet1!B1'].associated_cells)
+        self.assertEqual(
+            my_model.formulae['Sheet1!B1'].associated_cells,
+            my_model.formulae['Sheet1!B2'].associated_cells)
+
+    def test_get_cells_bulk(self):
+        model_compiler = ModelCompiler()
+        my_model = model_compiler.read_and_parse_dict(
+            {"A1": 1, "B1": 2, "A2": 3})
+
+        self.assertEqual(
+            [[1, 2], [3, 0]],
+            my_model.get_cells_bulk('Sheet1', range(1, 3), ['A', 'B']))
+
+    def test_get_cell_index(self):
+        model_compiler = ModelCompiler()
+        my_model = model_compiler.read_and_parse_dict(
+            {"B2": 1, "A2": 2, "B1": 3})
+
+        columns, rows = my_model.get_cell_index()
+        self.assertEqual(
+            [(1, 'Sheet1!B1'), (2, 'Sheet1!B2')], columns['Sheet1', 'B'])
+        self.assertEqual(
+            [(1, 'Sheet1!A2'), (2, 'Sheet1!B2')], rows['Sheet1', 2])
+
+        # New cells are picked up.
+        my_model.set_cell_value('Sheet1!B3', 4)
+        columns, _ = my_model.get_cell_index()
+        self.assertEqual((3, 'Sheet1!B3'), columns['Sheet1', 'B'][-1])
+
+        # Direct edits that keep the number of cells need a clear.
+        del my_model.cells['Sheet1!B3']
+        my_model.cells['Sheet1!B4'] = XLCell('Sheet1!B4', 5)
+        my_model.clear_cell_index()
+        columns, _ = my_model.get_cell_index()
+        self.assertEqual((4, 'Sheet1!B4'), columns['Sheet1', 'B'][-1])
+
+        # And a replaced cells dict of the same size.
+        my_model.cells = {
+            'Sheet1!C1': XLCell('Sheet1!C1', 1),
+            'Sheet1!C2': XLCell('Sheet1!C2', 2),
+            'Sheet1!C3': XLCell('Sheet1!C3', 3),
+            'Sheet1!C4': XLCell('Sheet1!C4', 4),
+        }
+        columns, _ = my_model.get_cell_index()
+        self.assertEqual([('Sheet1', 'C')], list(columns))
+
+        # The index is shared until it needs rebuilding.
+        self.assertIs(my_model.get_cell_index(), my_model.get_cell_index())
+
+    def test_build_code_shares_identical_formulas(self):
+        model_compiler = ModelCompiler()
+        my_model = model_compiler.read_and_parse_dict(
+            {"A1": 2, "B1": "=A1*2", "C1": "=A1*2", "D1": "=A1*3"})
+
+        cells = my_model.cells
+        self.assertIs(
+            cells['Sheet1!B1'].formula.ast, cells['Sheet1!C1'].formula.ast)
+        self.assertIsNot(
+            cells['Sheet1!B1'].formula.ast, cells['Sheet1!D1'].formula.ast)
+
+        evaluator = Evaluator(my_model)
+        self.assertEqual(4, evaluator.evaluate('Sheet1!C1'))
+        self.assertEqual(6, evaluator.evaluate('Sheet1!D1'))
+
+    def test_build_formula_code_uses_current_defined_names(self):
+        model_compiler = ModelCompiler()
+        my_model = model_compiler.read_and_parse_dict(
+            {"A1": 2, "A2": 5, "B1": "=Rate*2"}, build_code=False)
+        formula = my_model.cells['Sheet1!B1'].formula
+        evaluator = Evaluator(my_model)
+
+        my_model.defined_names['Rate'] = my_model.cells['Sheet1!A1']
+        my_model.build_formula_code(formula)
+        self.assertEqual(4, evaluator.evaluate('Sheet1!B1'))
+
+        # Re-pointing a name keeps the number of names.
+        my_model.defined_names['Rate'] = my_model.cells['Sheet1!A2']
+        my_model.build_formula_code(formula)
+        self.assertEqual(10, evaluator.evaluate('Sheet1!B1'))
+
+    def test_build_code_max_workers(self):
+        model_compiler = ModelCompiler()
+        my_model = model_compiler.read_and_parse_dict(
+            {"A1": 2, "B1": "=A1*2", "C1": "=SUM(A1:B1)"}, build_code=False)
+
+        my_model.build_code(max_workers=2)
+        self.assertEqual(
+            '(A1) * (2)', str(my_model.cells['Sheet1!B1'].formula.ast))
+
+        evaluator = Evaluator(my_model)
+        self.assertEqual(6, evaluator.evaluate('Sheet1!C1'))
@@ -52,6 +52,20 @@ class XLCellTest(unittest.TestCase):
         self.assertEqual(
             xltypes.XLCell('Bad Sheet!A1').address, 'Bad Sheet!A1')
 
+    def test_coordinates(self):
+        cell = xltypes.XLCell('Sheet1!AB12')
+        self.assertEqual(
+            ('Sheet1', 'AB', '12', 28, 12),
+            (cell.sheet, cell.column, cell.row, cell.column_index,
+             cell.row_index))
+
+        # The parsed local address is shared with other sheets.
+        other = xltypes.XLCell("'Other Sheet'!AB12")
+        self.assertEqual(
+            ('Other Sheet', 'AB', '12', 28, 12),
+            (other.sheet, other.column, other.row, other.column_index,
+             other.row_index))
+
     def test_value(self):
         cell = xltypes.XLCell('Sheet1!A1', 5)
         self.assertEqual(cell.value, 5)
@@ -68,6 +82,12 @@ class XLCellTest(unittest.TestCase):
         cell = xltypes.XLCell('Sheet1!A1', 5, 'SUM(A1:B1)')
         self.assertEqual(hash(cell), hash(('Sheet1', 1, 1)))
 
+    def test_slots(self):
+        cell = xltypes.XLCell('Sheet1!A1', 5)
+        self.assertFalse(hasattr(cell, '__dict__'))
+        with self.assertRaises(AttributeError):
+            cell.unknown = True
+
 
 class XLRangeTest(unittest.TestCase):
 
@@ -25,6 +25,21 @@ class ExcelTypeTest(unittest.TestCase):
     def test__repr__(self):
         self.assertEqual(repr(self.MyType(1)), '<MyType 1>')
 
+    def test_cast_from_native(self):
+        cast = func_xltypes.ExcelType.cast_from_native
+        self.assertIsInstance(cast(1), func_xltypes.Number)
+        self.assertIsInstance(cast(True), func_xltypes.Boolean)
+        self.assertIsInstance(cast('a'), func_xltypes.Text)
+        self.assertIsInstance(cast(None), func_xltypes.Blank)
+
+        number = func_xltypes.Number(1)
+        self.assertIs(cast(number), number)
+        error = xlerrors.ValueExcelError()
+        self.assertIs(cast(error), error)
+
+        with self.assertRaises(KeyError):
+            cast(object())
+
 
 class AbstractExcelTypeTest:
 
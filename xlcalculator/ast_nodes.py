@@ -9,7 +9,7 @@ from xlcalculator.xlfunctions import (
     func_xltypes
 )
 
-from .range import resolve_ranges
+from .range import is_full_column_or_row_reference, resolve_ranges
 
 PREFIX_OP_TO_FUNC = {
     '-': operator.OP_NEG,
@@ -38,10 +38,44 @@ INFIX_OP_TO_FUNC = {
 MAX_EMPTY = 100
 
 
+def _eval_address(context, addr):
+    """Evaluate a full cell or range address within `context`."""
+    xlrange = context.ranges.get(addr)
+    if xlrange is not None:
+        empty_row = 0
+        empty_col = 0
+        range_cells = []
+        for range_row in xlrange.cells:
+            row_cells = []
+            for col_addr in range_row:
+                cell = context.eval_cell(col_addr)
+                if cell.value == '' or cell.value is None:
+                    empty_col += 1
+                    if empty_col > MAX_EMPTY:
+                        break
+                else:
+                    empty_col = 0
+                row_cells.append(cell)
+            if not row_cells:
+                empty_row += 1
+                if empty_row > MAX_EMPTY:
+                    break
+            else:
+                empty_row = 0
+            range_cells.append(row_cells)
+        xlrange.value = data = func_xltypes.Array(range_cells)
+        return data
+
+    value = context.eval_cell(addr)
+    context.set_sheet()
+    return value
+
+
 class EvalContext:
 
     cells = None
     ranges = None
+    evaluator = None
     namespace = None
     seen = None
     ref = None
@@ -50,6 +84,8 @@ class EvalContext:
 
     def __init__(self, namespace=None, ref=None, seen=None, formula_sheet=None):
         self.seen = seen if seen is not None else []
+        # Set mirror of `seen` for O(1) cycle checks.
+        self._seen_set = set(self.seen)
         self.namespace = namespace if namespace is not None else xl.FUNCTIONS
         self.ref = ref
         from .references import CellReference
@@ -98,6 +134,14 @@ class ASTNode(object):
     def eval(self, context):
         raise NotImplementedError(f'`eval()` of {self}')
 
+    def compile(self):
+        """Return a callable taking a context that evaluates this node.
+
+        Nodes that can be lowered resolve their operator and constant
+        lookups once up front; all others fall back to `eval()`.
+        """
+        return self.eval
+
     def __repr__(self):
         return (
             f"<{self.__class__.__name__} "
@@ -130,6 +174,16 @@ class OperandNode(ASTNode):
         else:
             return func_xltypes.Number.cast(self.tvalue)
 
+    def compile(self):
+        # Errors embed the evaluated cell reference, so they stay dynamic.
+        if self.tsubtype == 'error':
+            return self.eval
+        try:
+            value = self.eval(None)
+        except Exception:
+            return self.eval
+        return lambda context: value
+
     def __str__(self):
         if self.tsubtype == "logical":
             return self.tvalue.title()
@@ -156,36 +210,10 @@ class RangeNode(OperandNode):
         return addr
 
     def eval(self, context):
-        addr = self.full_address(context)
-
-        if addr in context.ranges:
-            empty_row = 0
-            empty_col = 0
-            range_cells = []
-            for range_row in context.ranges[addr].cells:
-                row_cells = []
-                for col_addr in range_row:
-                    cell = context.eval_cell(col_addr)
-                    if cell.value == '' or cell.value is None:
-                        empty_col += 1
-                        if empty_col > MAX_EMPTY:
-                            break
-                    else:
-                        empty_col = 0
-                    row_cells.append(cell)
-                if not row_cells:
-                    empty_row += 1
-                    if empty_row > MAX_EMPTY:
-                        break
-                else:
-                    empty_row = 0
-                range_cells.append(row_cells)
-            context.ranges[addr].value = data = func_xltypes.Array(range_cells)
-            return data
+        return _eval_address(context, self.full_address(context))
 
-        value = context.eval_cell(addr)
-        context.set_sheet()
-        return value
+    def compile(self):
+        return self.eval
 
 
 class FullReferenceNode(OperandNode):
@@ -201,11 +229,12 @@ class FullReferenceNode(OperandNode):
             addr = f'{context.sheet}!{addr}'
         return addr
 
+    def compile(self):
+        return self.eval
+
     def eval(self, context):
         """Evaluate full column/row reference with lazy loading."""
 
-        import re
-        
         addr = self.full_address(context)
         
         # Parse the reference to determine if it's column or row
@@ -216,8 +245,7 @@ class FullReferenceNode(OperandNode):
             ref_part = addr
         
         # Check if it's a column reference (A:A, B:B) or row reference (1:1, 2:2)
-        if (re.match(r'^[A-Z]+:[A-Z]+$', ref_part) or 
-            re.match(r'^[0-9]+:[0-9]+$', ref_part)):
+        if is_full_column_or_row_reference(ref_part):
             try:
                 # Use evaluator's get_range_values for full references
                 range_data = context.evaluator.get_range_values(addr)
@@ -232,34 +260,7 @@ class FullReferenceNode(OperandNode):
     
     def _fallback_eval(self, context, addr):
         """Fallback to regular range evaluation."""
-        if addr in context.ranges:
-            empty_row = 0
-            empty_col = 0
-            range_cells = []
-            for range_row in context.ranges[addr].cells:
-                row_cells = []
-                for col_addr in range_row:
-                    cell = context.eval_cell(col_addr)
-                    if cell.value == '' or cell.value is None:
-                        empty_col += 1
-                        if empty_col > MAX_EMPTY:
-                            break
-                    else:
-                        empty_col = 0
-                    row_cells.append(cell)
-                if not row_cells:
-                    empty_row += 1
-                    if empty_row > MAX_EMPTY:
-                        break
-                else:
-                    empty_row = 0
-                range_cells.append(row_cells)
-            context.ranges[addr].value = data = func_xltypes.Array(range_cells)
-            return data
-
-        value = context.eval_cell(addr)
-        context.set_sheet()
-        return value
+        return _eval_address(context, addr)
 
 
 class OperatorNode(ASTNode):
@@ -288,6 +289,26 @@ class OperatorNode(ASTNode):
         else:
             raise ValueError(f'Invalid operator type: {self.ttype}')
 
+    def compile(self):
+        if self.ttype == 'operator-prefix' and self.left is None:
+            op = PREFIX_OP_TO_FUNC[self.tvalue]
+            right = self.right.compile()
+            return lambda context: op(right(context))
+
+        elif self.ttype == 'operator-infix':
+            op = INFIX_OP_TO_FUNC[self.tvalue]
+            left = self.left.compile()
+            right = self.right.compile()
+            return lambda context: op(left(context), right(context))
+
+        elif self.ttype == 'operator-postfix' and self.right is None:
+            op = POSTFIX_OP_TO_FUNC[self.tvalue]
+            left = self.left.compile()
+            return lambda context: op(left(context))
+
+        # Let eval() raise the appropriate error when evaluated.
+        return self.eval
+
     def __str__(self):
         left = f'({self.left}) ' if self.left is not None else ''
         right = f' ({self.right})' if self.right is not None else ''
@@ -360,8 +381,7 @@ class FunctionNode(ASTNode):
             cell_address = pitem.tvalue
             
             # Check if this looks like a cell reference and Excel has calculated it
-            if (hasattr(context, 'evaluator') and 
-                context.evaluator and 
+            if (context.evaluator is not None and
                 context.evaluator.model and
                 cell_address in context.evaluator.model.cells):
                 
@@ -412,15 +432,16 @@ class FunctionNode(ASTNode):
                 args.append(self._eval_parameter_with_excel_fallback(pvalue, context, func_name, param_index))
                 param_index += 1
         # 4. Inject context if function needs it, then run function and return result.
-        from .context import needs_context_by_name, create_context_cached
+        from .context import needs_context_by_name, create_context
         
         # Fast lookup by function name instead of signature inspection
         if needs_context_by_name(func.__name__):
             # Get current cell and evaluator from context
             current_cell_addr = context.ref
-            if hasattr(context, 'evaluator') and current_cell_addr in context.evaluator.model.cells:
+            if (context.evaluator is not None
+                    and current_cell_addr in context.evaluator.model.cells):
                 current_cell = context.evaluator.model.cells[current_cell_addr]
-                cell_context = create_context_cached(current_cell, context.evaluator)
+                cell_context = create_context(current_cell, context.evaluator)
                 
                 # Add context as keyword argument
                 sig = inspect.signature(func)
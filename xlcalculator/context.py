@@ -25,7 +25,7 @@ if TYPE_CHECKING:
 _CONTEXT_REQUIRED_FUNCTIONS: Set[str] = set()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CellContext:
     """
     Context for function execution with direct cell access.
@@ -84,40 +84,23 @@ def create_context(cell: 'XLCell', evaluator: 'Evaluator') -> CellContext:
     return CellContext(cell=cell, evaluator=evaluator)
 
 
-# ============================================================================
-# PERFORMANCE OPTIMIZATION - Context creation caching
-# ============================================================================
-
-# Cache for context objects to avoid repeated creation
-_CONTEXT_CACHE = {}
-
-def create_context_cached(cell: 'XLCell', evaluator: 'Evaluator') -> CellContext:
+def create_context_cached(
+        cell: 'XLCell', evaluator: 'Evaluator') -> CellContext:
     """
-    Optimized context creation with caching.
+    Create CellContext, kept for backward compatibility.
     
-    Caches context objects by cell address to avoid repeated creation
-    for the same cell during evaluation cycles.
-    
-    Args:
-        cell: XLCell object being evaluated
-        evaluator: Evaluator instance
-        
-    Returns:
-        CellContext with cell and evaluator access (cached if possible)
+    DEPRECATED: Use create_context() instead. Contexts are no longer
+    cached, building one is cheaper than the cache lookup was.
     """
-    # Use cell address as cache key
-    cache_key = (cell.address, id(evaluator))
-    
-    if cache_key not in _CONTEXT_CACHE:
-        _CONTEXT_CACHE[cache_key] = CellContext(cell=cell, evaluator=evaluator)
-    
-    return _CONTEXT_CACHE[cache_key]
+    return create_context(cell, evaluator)
 
 
 def clear_context_cache():
-    """Clear the context cache. Call this when evaluation is complete."""
-    global _CONTEXT_CACHE
-    _CONTEXT_CACHE.clear()
+    """
+    Kept for backward compatibility, there is no context cache to clear.
+    
+    DEPRECATED: Contexts are no longer cached, calling this is not needed.
+    """
 
 
 @lru_cache(maxsize=256)
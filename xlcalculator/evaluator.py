@@ -1,9 +1,53 @@
+import collections
+import functools
+import re
 import sys
-from functools import lru_cache
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from xlcalculator.xlfunctions import xl, func_xltypes
+from xlcalculator.xlfunctions import xl, xlerrors, func_xltypes
 
 from . import ast_nodes, xltypes
+from .context import needs_context_by_name
+from .range import COLUMN_LETTERS, column_index, resolve_sheet
+from .reference_aware_functions import is_reference_aware_function
+
+_A1_RE = re.compile(r'\$?([A-Z]+)\$?(\d+)$', re.IGNORECASE)
+
+# Excel errors raised by a formula become the cell's value.
+_EXCEL_ERROR_TYPES = (
+    xlerrors.RefExcelError, xlerrors.ValueExcelError,
+    xlerrors.NameExcelError, xlerrors.NumExcelError,
+    xlerrors.NaExcelError, xlerrors.DivZeroExcelError,
+    xlerrors.NullExcelError,
+)
+
+# Functions whose result may change without any of their arguments
+# changing.
+_VOLATILE_FUNCTIONS = frozenset({'NOW', 'TODAY', 'RAND', 'RANDBETWEEN'})
+
+
+def _is_memoizable(node):
+    """Whether a formula AST only depends on the cells it references.
+
+    Volatile functions, functions that resolve references at evaluation
+    time and full column/row references read state that isn't tracked
+    through `EvaluatorContext.eval_cell()`.
+    """
+    if isinstance(node, ast_nodes.FullReferenceNode):
+        return False
+    if isinstance(node, ast_nodes.FunctionNode):
+        func_name = node.tvalue.upper().replace('_XLFN.', '')
+        if (func_name in _VOLATILE_FUNCTIONS
+                or needs_context_by_name(func_name)
+                or is_reference_aware_function(func_name)):
+            return False
+        return all(_is_memoizable(arg) for arg in node.args)
+    if isinstance(node, ast_nodes.OperatorNode):
+        return all(
+            _is_memoizable(child) for child in (node.left, node.right)
+            if child is not None)
+    return True
 
 
 class EvaluatorContext(ast_nodes.EvalContext):
@@ -11,24 +55,29 @@ class EvaluatorContext(ast_nodes.EvalContext):
     def __init__(self, evaluator, ref, formula_sheet=None):
         super().__init__(evaluator.namespace, ref, formula_sheet=formula_sheet)
         self.evaluator = evaluator
+        self.cells = evaluator.model.cells
+        self.ranges = evaluator.model.ranges
+        self._cell_cache = {}
+        # Set once a referenced cell's value could not be memoized.
+        self.volatile = False
 
-    @property
-    def cells(self):
-        return self.evaluator.model.cells
-
-    @property
-    def ranges(self):
-        return self.evaluator.model.ranges
-
-    @lru_cache(maxsize=None)
     def eval_cell(self, addr):
+        try:
+            return self._cell_cache[addr]
+        except KeyError:
+            pass
+
         # Check for a cycle.
-        if addr in self.seen:
+        if addr in self._seen_set:
             raise RuntimeError(
                 f'Cycle detected for {addr}:\n- ' + '\n- '.join(self.seen))
         self.seen.append(addr)
+        self._seen_set.add(addr)
 
-        return self.evaluator.evaluate(addr, None)
+        value = self._cell_cache[addr] = self.evaluator.evaluate(addr, None)
+        if self.evaluator.resolve_names(addr) in self.evaluator._volatile:
+            self.volatile = True
+        return value
 
 
 class Evaluator:
@@ -40,6 +89,23 @@ class Evaluator:
             if namespace is not None else xl.FUNCTIONS.copy()
         self.cache_count = 0
         self._lazy_manager = None
+        # Cell address -> (formula AST, compiled callable of that AST,
+        # whether the AST is memoizable).
+        self._compiled_formulas = {}
+        # Cell address -> (formula AST, value, inputs) of formulas whose
+        # value only depends on other cells. `inputs` holds an
+        # (address, cell, value) triple for every cell the formula read, and
+        # an entry is only reused while all of them still hold.
+        self._memo = {}
+        self._memo_stamp = model._mutation_counter
+        # Formula cells whose last value could not be memoized.
+        self._volatile = set()
+        # Per thread, the formula cells whose value is known to be current
+        # during an evaluate() call, see _evaluate_checked().
+        self._query = threading.local()
+        # Range reference -> (cell index, kind, addresses), see
+        # get_range_values().
+        self._range_addresses = {}
 
     def _get_context(self, ref, formula_sheet=None):
         return EvaluatorContext(self, ref, formula_sheet)
@@ -48,11 +114,10 @@ class Evaluator:
         # Although defined names have been resolved in Model.create_node()
         # we need to attempt to resolve defined names as we might have been
         # given one in argument addr.
-        if addr not in self.model.defined_names:
+        defn = self.model.defined_names.get(addr)
+        if defn is None:
             return addr
 
-        defn = self.model.defined_names[addr]
-
         if isinstance(defn, xltypes.XLCell):
             return defn.address
 
@@ -68,34 +133,72 @@ class Evaluator:
                 f"reference.")
 
     def evaluate(self, addr, context=None):
+        if getattr(self._query, 'checked', None) is None:
+            return self._evaluate_checked(addr, set(), context)
+        return self._evaluate(addr, context)
+
+    def _evaluate_checked(self, addr, checked, context=None):
+        """Evaluate `addr`, treating the formula cells in `checked` as current.
+
+        Cells brought up to date along the way are added to `checked`, so
+        that every formula cell is checked against its memo at most once,
+        however many paths lead to it.
+        """
+        self._query.checked = checked
+        try:
+            return self._evaluate(addr, context)
+        finally:
+            self._query.checked = None
+
+    def _evaluate(self, addr, context=None):
         # 1. Resolve the address to a cell.
         addr = self.resolve_names(addr)
-        if addr not in self.model.cells:
+        cell = self.model.cells.get(addr)
+        if cell is None:
             # Blank cell that has no stored value in the model.
             return func_xltypes.BLANK
-        cell = self.model.cells[addr]
 
         # 2. If there is no formula, we simply return the cell value.
+        #    Values stored by a previous evaluation are already cast.
         if (cell.formula is None or cell.formula.evaluate is False):
-            return func_xltypes.ExcelType.cast_from_native(
-                self.model.cells[addr].value)
+            value = cell.value
+            if isinstance(value, func_xltypes.ExcelType):
+                return value
+            return func_xltypes.ExcelType.cast_from_native(value)
+
+        # 3. Reuse the value of a formula already brought up to date during
+        #    this call, or of a memoized formula whose inputs are unchanged.
+        checked = self._query.checked
+        if addr in checked:
+            return cell.value
+        ast = cell.formula.ast
+        if self._memo_stamp != self.model._mutation_counter:
+            self.clear_memo()
+        memo = self._memo.get(addr)
+        if (memo is not None and memo[0] is ast
+                and self._inputs_unchanged(memo[2])):
+            cell.value = memo[1]
+            checked.add(addr)
+            return memo[1]
 
-        # 3. Prepare the execution environment and evaluate the formula.
+        # 4. Prepare the execution environment and evaluate the formula.
         #    Extract formula sheet context for proper Excel behavior
         formula_sheet = cell.formula.sheet_name if cell.formula else None
         context = context if context is not None else self._get_context(addr, formula_sheet)
         
         # Context injection now handles evaluator access for dynamic range functions
         
+        memoizable = False
         try:
-            value = cell.formula.ast.eval(context)
+            # Formulas of models built with `build_code=False` are parsed on
+            # first evaluation.
+            if ast is None:
+                ast = self.model.build_formula_code(cell.formula)
+            ast, compiled, memoizable = self._compile(addr, ast)
+            value = compiled(context)
         except Exception as err:
             # Handle Excel errors as return values, not exceptions
-            from xlcalculator.xlfunctions import xlerrors
-            if isinstance(err, (xlerrors.RefExcelError, xlerrors.ValueExcelError, 
-                              xlerrors.NameExcelError, xlerrors.NumExcelError, 
-                              xlerrors.NaExcelError, xlerrors.DivZeroExcelError,
-                              xlerrors.NullExcelError)):
+            if isinstance(err, _EXCEL_ERROR_TYPES):
                 value = err
             else:
                 raise RuntimeError(
@@ -103,14 +206,126 @@ class Evaluator:
                     f"{cell.formula.formula}: {repr(err)}"
                 ).with_traceback(sys.exc_info()[2])
 
-        # 4. Update the cell value.
+        # 5. Update the cell value.
         #    Note for later: If an array is returned, we should distribute the
         #    values to the respective cell (known as spilling).
         cell.value = value
-        cell.need_update = False
+
+        if memoizable and not context.volatile:
+            self._memo[addr] = (ast, value, self._get_inputs(context))
+            self._volatile.discard(addr)
+            checked.add(addr)
+        else:
+            self._volatile.add(addr)
 
         return value
 
+    def evaluate_all(self, max_workers=None):
+        """Evaluates every formula cell in the model.
+
+        Cells are evaluated in dependency levels: a cell is only evaluated
+        once every formula cell it references has been. When `max_workers`
+        is greater than one, the independent cells of each level are
+        evaluated on a thread pool of that size.
+
+        Cells finished in an earlier level are current for the rest of the
+        run: their dependents read their values without checking or
+        evaluating them again. Within a level, each thread therefore only
+        writes the memo, compiled code and value of its own cell.
+
+        Returns a dict mapping cell address to evaluated value.
+        """
+        if max_workers is not None and max_workers > 1:
+            with ThreadPoolExecutor(max_workers) as executor:
+                return self._evaluate_levels(executor.map)
+        return self._evaluate_levels(map)
+
+    def _evaluate_levels(self, map_func):
+        # Skip the short-address aliases of the active sheet's cells.
+        formula_cells = {
+            addr: cell for addr, cell in self.model.cells.items()
+            if cell.formula is not None and addr == cell.address
+        }
+
+        pending = {}
+        dependents = collections.defaultdict(list)
+        for addr, cell in formula_cells.items():
+            deps = {
+                dep for dep in cell.formula.associated_cells
+                if dep in formula_cells
+            }
+            pending[addr] = len(deps)
+            for dep in deps:
+                dependents[dep].append(addr)
+
+        values = {}
+        done = set()
+        evaluate = functools.partial(self._evaluate_checked, checked=done)
+        level = [addr for addr, count in pending.items() if count == 0]
+        while level:
+            next_level = []
+            for addr, value in zip(level, map_func(evaluate, level)):
+                values[addr] = value
+                done.add(addr)
+                for dependent in dependents[addr]:
+                    pending[dependent] -= 1
+                    if not pending[dependent]:
+                        next_level.append(dependent)
+            level = next_level
+
+        # Cells on a dependency cycle never reach a level; evaluating them
+        # directly reports the cycle.
+        for addr in formula_cells:
+            if addr not in values:
+                values[addr] = evaluate(addr)
+
+        return values
+
+    def _compile(self, addr, ast):
+        compiled = self._compiled_formulas.get(addr)
+        if compiled is None or compiled[0] is not ast:
+            compiled = self._compiled_formulas[addr] = (
+                ast, ast.compile(), _is_memoizable(ast))
+        return compiled
+
+    def _get_inputs(self, context):
+        cells = self.model.cells
+        inputs = []
+        for addr in context._cell_cache:
+            addr = self.resolve_names(addr)
+            cell = cells.get(addr)
+            inputs.append(
+                (addr, cell, cell.value if cell is not None else None))
+        return tuple(inputs)
+
+    def _inputs_unchanged(self, inputs):
+        """Whether the cells a memoized formula read still hold its inputs.
+
+        Formula inputs are brought up to date first, which reuses their own
+        memoized values when their inputs are unchanged in turn. Values are
+        compared by identity: a cell that was assigned or re-evaluated holds
+        a new object.
+        """
+        cells = self.model.cells
+        for addr, input_cell, value in inputs:
+            cell = cells.get(addr)
+            if cell is not input_cell:
+                return False
+            if cell is None:
+                continue
+            formula = cell.formula
+            if formula is not None and formula.evaluate is not False:
+                self.evaluate(addr)
+            if cell.value is not value:
+                return False
+        return True
+
+    def clear_memo(self):
+        """Forget all memoized formula values."""
+        self._memo.clear()
+        self._range_addresses.clear()
+        self._memo_stamp = self.model._mutation_counter
+
     def set_cell_value(self, address, value):
         """Sets the value of a cell in the model."""
         self.model.set_cell_value(address, value)
@@ -125,12 +340,51 @@ class Evaluator:
         if ':' not in range_ref:
             # Single cell
             return [[self.get_cell_value(range_ref)]]
-        
+
+        # The addresses a range covers are resolved once and looked up on
+        # every call. Those of full columns and rows come from the model's
+        # cell index and are resolved again when it is rebuilt.
+        cached = self._range_addresses.get(range_ref)
+        if cached is None or (
+                cached[0] is not None
+                and cached[0] is not self.model.get_cell_index()):
+            cached = self._range_addresses[range_ref] = \
+                self._get_range_addresses(range_ref)
+        _, kind, addresses = cached
+
+        if kind != 'range':
+            get_cell = self.model.cells.get
+            cells = [get_cell(addr) for addr in addresses]
+            if any(cell is None for cell in cells):
+                # The index lost track of a cell replaced by a direct edit
+                # that kept the number of cells.
+                self.model.clear_cell_index()
+                return self.get_range_values(range_ref)
+        if kind == 'column':
+            # Filter out None entries and return
+            return [[cell.value] for cell in cells if cell.value is not None]
+        if kind == 'row':
+            values = [cell.value for cell in cells]
+            return [values] if values else [[]]
+        # Cells that don't exist in the model read as 0.
+        get_cell = self.model.cells.get
+        return [
+            [0 if cell is None else cell.value for cell in map(get_cell, row)]
+            for row in addresses
+        ]
+
+    def _get_range_addresses(self, range_ref):
+        """Resolves a range reference to the cell addresses it covers.
+
+        Returns an `(index, kind, addresses)` tuple: the addresses of the
+        cells of a full column ('column') or full row ('row') that exist in
+        the model, along with the cell index they were read from, or the
+        rows of addresses of a regular range ('range') and None.
+        """
         # Handle sheet prefix
-        sheet_prefix = ""
-        if '!' in range_ref:
-            sheet_prefix, range_part = range_ref.split('!', 1)
-            sheet_prefix += '!'
+        sheet, sep, range_part = range_ref.partition('!')
+        if sep:
+            sheet_prefix = sheet + '!'
         else:
             range_part = range_ref
             sheet_prefix = 'Sheet1!'
@@ -140,71 +394,46 @@ class Evaluator:
         
         # Check for full column references (A:A)
         if start_ref == end_ref and start_ref.isalpha():
-            # Full column reference like A:A
-            col_letter = start_ref
-            values = []
-            # Get all cells in this column that exist in the model
-            for cell_addr, cell in self.model.cells.items():
-                if cell_addr.startswith(f'{sheet_prefix}{col_letter}'):
-                    # Extract row number
-                    row_part = cell_addr[len(f'{sheet_prefix}{col_letter}'):]
-                    if row_part.isdigit():
-                        row_num = int(row_part)
-                        # Ensure we have enough rows in values
-                        while len(values) < row_num:
-                            values.append([None])
-                        values[row_num - 1] = [cell.value]
-            
-            # Filter out None entries and return
-            return [[item[0]] for item in values if item[0] is not None]
+            # Full column reference like A:A, cells that exist in the model
+            index = self.model.get_cell_index()
+            return index, 'column', [
+                cell_addr for _, cell_addr in index[0].get(
+                    (resolve_sheet(sheet_prefix[:-1]), start_ref), ())
+            ]
         
         # Check for full row references (1:1)
         elif start_ref == end_ref and start_ref.isdigit():
-            # Full row reference like 1:1
-            row_num = start_ref
-            values = []
-            # Get all cells in this row that exist in the model
-            for cell_addr, cell in self.model.cells.items():
-                if cell_addr.startswith(f'{sheet_prefix}') and cell_addr.endswith(row_num):
-                    values.append(cell.value)
-            
-            return [values] if values else [[]]
+            # Full row reference like 1:1, cells that exist in the model
+            index = self.model.get_cell_index()
+            return index, 'row', [
+                cell_addr for _, cell_addr in index[1].get(
+                    (resolve_sheet(sheet_prefix[:-1]), int(start_ref)), ())
+            ]
         
         # Regular range parsing for A1:B2 format
         else:
-            # Extract column and row from start reference
-            start_col_letter = ''.join(c for c in start_ref if c.isalpha())
-            start_row_digits = ''.join(c for c in start_ref if c.isdigit())
-            if not start_row_digits:
+            start_match = _A1_RE.match(start_ref)
+            end_match = _A1_RE.match(end_ref)
+            if start_match is None or end_match is None:
                 raise ValueError(f"Invalid range format: {range_ref}")
-            start_row = int(start_row_digits)
-            start_col = ord(start_col_letter) - ord('A') + 1
-            
-            # Extract column and row from end reference  
-            end_col_letter = ''.join(c for c in end_ref if c.isalpha())
-            end_row_digits = ''.join(c for c in end_ref if c.isdigit())
-            if not end_row_digits:
-                raise ValueError(f"Invalid range format: {range_ref}")
-            end_row = int(end_row_digits)
-            end_col = ord(end_col_letter) - ord('A') + 1
-            
-            values = []
-            for row in range(start_row, end_row + 1):
-                row_values = []
-                for col in range(start_col, end_col + 1):
-                    col_letter = chr(ord('A') + col - 1)
-                    cell_ref = f'{sheet_prefix}{col_letter}{row}'
-                    value = self.get_cell_value(cell_ref)
-                    row_values.append(value)
-                values.append(row_values)
-            
-            return values
-    
+            start_col_letter, start_row = start_match.groups()
+            end_col_letter, end_row = end_match.groups()
+            start_row, end_row = int(start_row), int(end_row)
+            start_col = column_index(start_col_letter)
+            end_col = column_index(end_col_letter)
+            col_prefixes = [
+                f'{sheet_prefix}{col_letter}'
+                for col_letter in COLUMN_LETTERS[start_col:end_col + 1]
+            ]
+
+            return None, 'range', [
+                [f'{prefix}{row}' for prefix in col_prefixes]
+                for row in range(start_row, end_row + 1)
+            ]
+
     def clear_context_cache(self):
-        """Clear context cache to free memory after evaluation cycles."""
-        from .context import clear_context_cache
-        clear_context_cache()
-    
+        """Kept for backward compatibility, contexts are no longer cached."""
+
     def enable_lazy_loading(self):
         """Enable lazy loading for this evaluator."""
         from .lazy_loading import patch_evaluator_with_lazy_loading
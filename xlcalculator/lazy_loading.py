@@ -10,8 +10,31 @@ This module implements lazy loading for Excel ranges following ATDD principles:
 ATDD Principle: Tests specify Excel behavior, implementation follows exactly.
 """
 
+import functools
 import logging
 from xlcalculator import xltypes
+from xlcalculator.xlfunctions import func_xltypes
+from xlcalculator.range import COLUMN_LETTERS, is_full_range
+
+
+# The same few full-range addresses ("Sheet1!A:A", ...) recur across the
+# formulas of a workbook, so their parses are shared.
+@functools.lru_cache(maxsize=8192)
+def _parse_range_reference(address_str):
+    """Parse a range address, or return None if it can't be parsed."""
+    from xlcalculator.range import RangeReference
+    
+    try:
+        return RangeReference.parse(address_str)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_sheet_and_range(address_str):
+    """Split a range address into its sheet name and range part."""
+    from xlcalculator.references import CellReference
+    return CellReference.parse(address_str).to_tuple()
 
 
 class ExcelCompliantLazyRange:
@@ -22,23 +45,23 @@ class ExcelCompliantLazyRange:
     No fallbacks, no hardcoded data, no masking of Excel errors.
     """
     
+    __slots__ = (
+        'address_str', 'name', 'model', 'sheet', 'value', '_cells',
+        '_cells_stamp', '_is_full_range', '_range_ref')
+    
     def __init__(self, address_str, model, name=None):
         self.address_str = address_str
         self.name = name or address_str
         self.model = model  # Access to actual Excel data
         self.sheet = None
+        self.value = None  # Set when the range is evaluated
         self._cells = None  # Lazy-loaded
-        self._is_full_range = self._check_if_full_range(address_str)
-    
-    def _check_if_full_range(self, address_str):
-        """Check if this is a full column/row reference that needs lazy loading."""
-        from xlcalculator.range import RangeReference
-        
-        try:
-            range_ref = RangeReference.parse(address_str)
-            return range_ref.is_full_range()
-        except Exception:
-            return False
+        self._cells_stamp = None  # Model version _cells was built at
+        self._is_full_range = is_full_range(address_str)
+        # Only full ranges need the parsed bounds when resolving.
+        self._range_ref = (
+            _parse_range_reference(address_str) if self._is_full_range
+            else None)
     
     @property
     def cells(self):
@@ -51,15 +74,25 @@ class ExcelCompliantLazyRange:
         - Invalid ranges return #REF! error
         - No fallbacks, no hardcoded data
         """
-        if self._cells is None:
+        # Full ranges are bounded through the cell index, a new object
+        # whenever cells were added or removed, even without
+        # set_cell_value().
+        counter = getattr(self.model, '_mutation_counter', None)
+        index = (
+            self.model.get_cell_index() if self._is_full_range else None)
+        stamp = self._cells_stamp
+        if (self._cells is None or stamp[0] != counter
+                or stamp[1] is not index):
+            self._cells_stamp = (counter, index)
             if self._is_full_range:
-                self._cells = self._resolve_full_range_excel_compliant()
+                self._cells = self._resolve_full_range_excel_compliant(
+                    index)
             else:
                 # For normal ranges, use standard resolution
                 self._cells = self._resolve_normal_range()
         return self._cells
     
-    def _resolve_full_range_excel_compliant(self):
+    def _resolve_full_range_excel_compliant(self, index):
         """
         Resolve full range using actual Excel data boundaries.
         
@@ -69,24 +102,22 @@ class ExcelCompliantLazyRange:
         - Preserve Excel's empty cell behavior
         """
         sheet_name, range_part = self._parse_range()
-        
-        if ':' not in range_part:
-            return [[self.address_str]]  # Single cell
-        
-        left, right = range_part.split(':')
+        range_ref = self._range_ref
         
         # For full column (A:A), find actual data boundaries
-        if left.isalpha() and right.isalpha() and left == right:
-            return self._resolve_full_column_excel_data(sheet_name, left)
+        if range_ref.is_full_column:
+            return self._resolve_full_column_excel_data(
+                sheet_name, COLUMN_LETTERS[range_ref.min_col], index)
         
         # For full row (1:1), find actual data boundaries  
-        if left.isdigit() and right.isdigit() and left == right:
-            return self._resolve_full_row_excel_data(sheet_name, left)
+        if range_ref.is_full_row:
+            return self._resolve_full_row_excel_data(
+                sheet_name, str(range_ref.min_row), index)
         
         # Should not reach here for full ranges
         return [[self.address_str]]
     
-    def _resolve_full_column_excel_data(self, sheet_name, column):
+    def _resolve_full_column_excel_data(self, sheet_name, column, index):
         """
         Resolve full column using actual Excel data.
         
@@ -95,23 +126,18 @@ class ExcelCompliantLazyRange:
         - Return actual cell values, not hardcoded data
         - Preserve Excel's handling of empty cells
         """
-        cells = []
-        
         # Find the actual last row with data in this column
-        max_row = self._find_last_row_with_data(sheet_name, column)
+        max_row = self._find_last_row_with_data(sheet_name, column, index)
         
         if max_row == 0:
             # Column is completely empty - Excel behavior
             return [[]]
         
         # Build cell references for actual data range
-        for row in range(1, max_row + 1):
-            cell_ref = f"{sheet_name}!{column}{row}"
-            cells.append([cell_ref])
-        
-        return cells
+        prefix = f"{sheet_name}!{column}"
+        return [[f"{prefix}{row}"] for row in range(1, max_row + 1)]
     
-    def _resolve_full_row_excel_data(self, sheet_name, row):
+    def _resolve_full_row_excel_data(self, sheet_name, row, index):
         """
         Resolve full row using actual Excel data.
         
@@ -120,22 +146,21 @@ class ExcelCompliantLazyRange:
         - Return actual cell values, not hardcoded data
         """
         # Find the actual last column with data in this row
-        max_col = self._find_last_col_with_data(sheet_name, row)
+        max_col = self._find_last_col_with_data(sheet_name, row, index)
         
         if max_col == 0:
             # Row is completely empty - Excel behavior
             return [[]]
         
         # Build cell references for actual data range
-        cells = []
-        for col_num in range(1, max_col + 1):
-            col_letter = chr(ord('A') + col_num - 1)
-            cell_ref = f"{sheet_name}!{col_letter}{row}"
-            cells.append(cell_ref)
+        cells = [
+            f"{sheet_name}!{col_letter}{row}"
+            for col_letter in COLUMN_LETTERS[1:max_col + 1]
+        ]
         
         return [cells]  # Single row with multiple columns
     
-    def _find_last_row_with_data(self, sheet_name, column):
+    def _find_last_row_with_data(self, sheet_name, column, index):
         """
         Find the last row with actual data in the specified column.
         
@@ -143,25 +168,10 @@ class ExcelCompliantLazyRange:
         - Scan actual model cells to find boundaries
         - Return 0 if no data found
         """
-        max_row = 0
-        
-        # Scan all cells in the model for this sheet and column
-        from xlcalculator.range import ParsedAddress
-        
-        for cell_address in self.model.cells:
-            try:
-                parsed = ParsedAddress.parse(cell_address)
-                if parsed.sheet == sheet_name and parsed.column == column:
-                    # Check if cell has actual data (not empty/zero)
-                    cell_value = self.model.cells[cell_address].value
-                    if cell_value is not None and cell_value != 0 and cell_value != '':
-                        max_row = max(max_row, parsed.row)
-            except:
-                continue
-        
-        return max_row
+        columns, _ = index
+        return self._find_last_with_data(columns.get((sheet_name, column), ()))
     
-    def _find_last_col_with_data(self, sheet_name, row):
+    def _find_last_col_with_data(self, sheet_name, row, index):
         """
         Find the last column with actual data in the specified row.
         
@@ -169,25 +179,23 @@ class ExcelCompliantLazyRange:
         - Scan actual model cells to find boundaries
         - Return 0 if no data found
         """
-        max_col = 0
-        
-        # Scan all cells in the model for this sheet and row
-        from xlcalculator.range import ParsedAddress
-        from openpyxl.utils.cell import column_index_from_string
-        
-        for cell_address in self.model.cells:
+        _, rows = index
+        return self._find_last_with_data(rows.get((sheet_name, int(row)), ()))
+    
+    def _find_last_with_data(self, entries):
+        """Return the position of the last indexed cell holding data, or 0."""
+        cells = self.model.cells
+        for position, cell_address in reversed(entries):
             try:
-                parsed = ParsedAddress.parse(cell_address)
-                if parsed.sheet == sheet_name and parsed.row == int(row):
-                    col_num = column_index_from_string(parsed.column)
-                    # Check if cell has actual data
-                    cell_value = self.model.cells[cell_address].value
-                    if cell_value is not None and cell_value != 0 and cell_value != '':
-                        max_col = max(max_col, col_num)
-            except:
+                # Check if cell has actual data (not empty/zero). A single
+                # truth test covers None, 0 and '' and their Excel types;
+                # only Excel FALSE is falsy yet still data.
+                cell_value = cells[cell_address].value
+                if cell_value or isinstance(cell_value, func_xltypes.Boolean):
+                    return position
+            except Exception:
                 continue
-        
-        return max_col
+        return 0
     
     def _resolve_normal_range(self):
         """Resolve normal (non-full) ranges using standard method."""
@@ -202,9 +210,7 @@ class ExcelCompliantLazyRange:
     
     def _parse_range(self):
         """Parse range to extract sheet name and range part."""
-        from xlcalculator.references import CellReference
-        cell_ref = CellReference.parse(self.address_str)
-        return cell_ref.to_tuple()
+        return _parse_sheet_and_range(self.address_str)
     
     @property
     def address(self):
@@ -223,6 +229,8 @@ class ExcelCompliantLazyManager:
     ATDD Principle: No fallbacks, exact Excel behavior only.
     """
     
+    __slots__ = ('evaluator', 'original_get_range_values')
+    
     def __init__(self, evaluator):
         self.evaluator = evaluator
         self.original_get_range_values = evaluator.get_range_values
@@ -266,17 +274,6 @@ def patch_evaluator_with_lazy_loading(evaluator):
     return lazy_manager
 
 
-def is_full_range(range_str):
-    """Check if a range reference is a full column/row that needs lazy loading."""
-    from xlcalculator.range import RangeReference
-    
-    try:
-        range_ref = RangeReference.parse(range_str)
-        return range_ref.is_full_range()
-    except Exception:
-        return False
-
-
 def create_excel_compliant_lazy_range(address_str, model, name=None):
     """
     Factory function to create Excel-compliant lazy ranges.
@@ -1,12 +1,40 @@
+import collections
 import copy
+import functools
 import gzip
+import itertools
 import jsonpickle
 import logging
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 
 from . import xltypes, reader, parser, tokenizer
 
+_FORMULA_PARSER = parser.FormulaParser()
+
+# Characters of serialized model encoded per write when persisting.
+_WRITE_CHUNK_SIZE = 1 << 20
+
+
+def _parse_formula(formula, defined_names):
+    return _FORMULA_PARSER.parse(formula, defined_names)
+
+
+def _copy_cell(cell):
+    """Copy a cell into an extracted model.
+
+    Evaluation replaces cell values rather than changing them in place, so
+    only the parts the new model changes are copied: the formula, whose
+    AST is rebuilt, and the defined name back-links.
+    """
+    new_cell = copy.copy(cell)
+    new_cell.defined_names = list(cell.defined_names)
+    if cell.formula is not None:
+        new_cell.formula = copy.copy(cell.formula)
+    return new_cell
+
 
 @dataclass
 class Model():
@@ -19,22 +47,34 @@ class Model():
         init=False, default_factory=dict, compare=True, hash=True, repr=True)
     defined_names: dict = field(
         init=False, default_factory=dict, compare=True, hash=True, repr=True)
+    # Bumped on every set_cell_value() so that derived data, like the cells
+    # of lazy ranges, knows when to rebuild.
+    _mutation_counter: int = field(
+        init=False, default=0, compare=False, hash=False, repr=False)
+    # (cells dict, number of cells, (column index, row index)), see
+    # get_cell_index().
+    _cell_index: tuple = field(
+        init=False, default=None, compare=False, hash=False, repr=False)
 
     def set_cell_value(self, address, value):
         """Sets a new value for a specified cell."""
-        if address in self.defined_names:
-            if isinstance(self.defined_names[address], xltypes.XLCell):
-                address = self.defined_names[address].address
+        self._mutation_counter += 1
+        defn = self.defined_names.get(address)
+        if isinstance(defn, xltypes.XLCell):
+            address = defn.address
 
         if isinstance(address, str):
-            if address in self.cells:
-                self.cells[address].value = copy.copy(value)
+            cell = self.cells.get(address)
+            if cell is not None:
+                cell.value = copy.copy(value)
             else:
-                self.cells[address] = xltypes.XLCell(address, copy.copy(value))
+                cell = xltypes.XLCell(address, copy.copy(value))
+                self.cells[cell.address] = cell
 
         elif isinstance(address, xltypes.XLCell):
-            if address.address in self.cells:
-                self.cells[address.address].value = value
+            cell = self.cells.get(address.address)
+            if cell is not None:
+                cell.value = value
             else:
                 self.cells[address.address] = xltypes.XLCell
                 (address.address, value)
@@ -46,13 +86,14 @@ class Model():
             )
 
     def get_cell_value(self, address):
-        if address in self.defined_names:
-            if isinstance(self.defined_names[address], xltypes.XLCell):
-                address = self.defined_names[address].address
+        defn = self.defined_names.get(address)
+        if isinstance(defn, xltypes.XLCell):
+            address = defn.address
 
         if isinstance(address, str):
-            if address in self.cells:
-                return self.cells[address].value
+            cell = self.cells.get(address)
+            if cell is not None:
+                return cell.value
             else:
                 logging.debug(
                     "Trying to get value for cell {address} but that cell "
@@ -60,8 +101,9 @@ class Model():
                 return 0
 
         elif isinstance(address, xltypes.XLCell):
-            if address.address in self.cells:
-                return self.cells[address.address].value
+            cell = self.cells.get(address.address)
+            if cell is not None:
+                return cell.value
             else:
                 logging.debug(
                     "Trying to get value for cell {address.address} but "
@@ -74,6 +116,60 @@ class Model():
                 f"{address}. XLCell or a string is needed."
             )
 
+    def get_cells_bulk(self, sheet, rows, columns):
+        """Gets the values of a block of cells on one sheet, row by row.
+
+        `rows` holds row numbers and `columns` column letters. Like
+        get_cell_value(), cells that don't exist in the model read as 0.
+        """
+        get_cell = self.cells.get
+        col_prefixes = [f'{sheet}!{column}' for column in columns]
+        values = []
+        for row in rows:
+            row_cells = [get_cell(f'{prefix}{row}') for prefix in col_prefixes]
+            values.append(
+                [0 if cell is None else cell.value for cell in row_cells])
+        return values
+
+    def get_cell_index(self):
+        """Indexes the cells of the model by column and by row.
+
+        Returns a `(columns, rows)` tuple. `columns` maps `(sheet, column)`
+        to the sorted `(row, address)` pairs of the cells in that column and
+        `rows` maps `(sheet, row)` to the sorted `(column_index, address)`
+        pairs of the cells in that row. Short address aliases are left out.
+
+        The index only tracks addresses, not values. It is rebuilt when
+        `cells` is replaced or the number of cells changes, which covers
+        set_cell_value(), and is the same object until then. Direct edits
+        of `cells` that keep the number of cells, like replacing one cell
+        by another, need clear_cell_index().
+        """
+        cells = self.cells
+        cached = self._cell_index
+        if (cached is None or cached[0] is not cells
+                or cached[1] != len(cells)):
+            columns = collections.defaultdict(list)
+            rows = collections.defaultdict(list)
+            for address, cell in cells.items():
+                if address != cell.address:
+                    continue
+                columns[cell.sheet, cell.column].append(
+                    (cell.row_index, address))
+                rows[cell.sheet, cell.row_index].append(
+                    (cell.column_index, address))
+            for entries in columns.values():
+                entries.sort()
+            for entries in rows.values():
+                entries.sort()
+            cached = self._cell_index = (
+                cells, len(cells), (dict(columns), dict(rows)))
+        return cached[2]
+
+    def clear_cell_index(self):
+        """Forget the cell index, see get_cell_index()."""
+        self._cell_index = None
+
     def persist_to_json_file(self, fname):
         """Writes the state to disk.
 
@@ -91,8 +187,13 @@ class Model():
             if os.path.splitext(fname)[-1].lower() in ['.gzip', '.gz'] \
             else open
 
+        # Encoded and written in chunks, so that no bytes copy of the whole
+        # document is held next to the string.
+        json_str = jsonpickle.encode(output, keys=True)
         with file_open(fname, 'wb') as fp:
-            fp.write(jsonpickle.encode(output, keys=True).encode())
+            for start in range(0, len(json_str), _WRITE_CHUNK_SIZE):
+                fp.write(
+                    json_str[start:start + _WRITE_CHUNK_SIZE].encode())
 
     def construct_from_json_file(self, fname, build_code=False):
         """Constructs a graph from a state persisted to disk."""
@@ -120,35 +221,62 @@ class Model():
         if build_code:
             self.build_code()
 
-    def build_code(self):
-        """Define the Python code for all cells in the dict of cells."""
+    def build_code(self, max_workers=None):
+        """Define the Python code for all cells in the dict of cells.
 
-        for cell in self.cells:
-            if self.cells[cell].formula is not None:
-                defined_names = {
-                    name: defn.address
-                    for name, defn in self.defined_names.items()}
-                self.cells[cell].formula.ast = parser.FormulaParser().parse(
-                    self.cells[cell].formula.formula, defined_names)
+        When `max_workers` is greater than one, the distinct formulas are
+        parsed on a process pool of that size.
+        """
+        formula_cells = [
+            cell for cell in self.cells.values() if cell.formula is not None]
+        if not formula_cells:
+            return
+        defined_names = {
+            name: defn.address for name, defn in self.defined_names.items()}
+
+        # Identical formulas, typically filled down a column or across a
+        # row, share a single AST. Nodes are not modified after parsing.
+        formulas = list(dict.fromkeys(
+            cell.formula.formula for cell in formula_cells))
+        parse = functools.partial(
+            _parse_formula, defined_names=defined_names)
+        if max_workers is not None and max_workers > 1:
+            with ProcessPoolExecutor(max_workers) as executor:
+                asts = dict(zip(
+                    formulas, executor.map(parse, formulas, chunksize=256)))
+        else:
+            asts = dict(zip(formulas, map(parse, formulas)))
 
-    def __eq__(self, other):
+        for cell in formula_cells:
+            cell.formula.ast = asts[cell.formula.formula]
 
-        cells_comparison = []
-        for self_cell in self.cells:
-            cells_comparison.append(
-                self.cells[self_cell] == other.cells[self_cell])
+    def build_formula_code(self, formula):
+        """Parse a single formula, e.g. one skipped with `build_code=False`.
 
-        defined_names_comparison = []
-        for self_defined_names in self.defined_names:
-            defined_names_comparison.append(
-                self.defined_names[self_defined_names]
-                    == other.defined_names[self_defined_names])
+        Returns the AST, which is also stored on the formula.
+        """
+        defined_names = {
+            name: defn.address for name, defn in self.defined_names.items()}
+        formula.ast = _parse_formula(formula.formula, defined_names)
+        return formula.ast
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if self.__class__ != other.__class__:
+            return False
+
+        # Stops at the first difference. Equal sizes make the one-way
+        # scans below symmetric.
+        other_cells = other.cells
+        other_defined_names = other.defined_names
         return (
-            self.__class__ == other.__class__
-            and all(cells_comparison)
-            and all(defined_names_comparison)
-        )
+            len(self.cells) == len(other_cells)
+            and len(self.defined_names) == len(other_defined_names)
+            and all(cell == other_cells.get(addr)
+                    for addr, cell in self.cells.items())
+            and all(defn == other_defined_names.get(name)
+                    for name, defn in self.defined_names.items()))
 
 
 class ModelCompiler:
@@ -198,51 +326,44 @@ class ModelCompiler:
         This allows tests to use 'A1' instead of 'Sheet!A1' for the active sheet.
         """
         if hasattr(archive, 'book') and archive.book.active:
-            active_sheet_name = archive.book.active.title
-            
-            # Create aliases for active sheet cells
-            active_cells = {k: v for k, v in self.model.cells.items() 
-                          if k.startswith(f'{active_sheet_name}!')}
-            
-            for full_addr, cell in active_cells.items():
-                short_addr = full_addr.replace(f'{active_sheet_name}!', '')
-                if short_addr not in self.model.cells:  # Don't overwrite existing cells
-                    self.model.cells[short_addr] = cell
-                    
-            # Also create aliases for formulae
-            active_formulae = {k: v for k, v in self.model.formulae.items() 
-                             if k.startswith(f'{active_sheet_name}!')}
-            
-            for full_addr, formula in active_formulae.items():
-                short_addr = full_addr.replace(f'{active_sheet_name}!', '')
-                if short_addr not in self.model.formulae:  # Don't overwrite existing formulae
-                    self.model.formulae[short_addr] = formula
+            prefix = f'{archive.book.active.title}!'
+            prefix_len = len(prefix)
+
+            # Create aliases for active sheet cells and formulae, without
+            # overwriting existing entries.
+            for entries in (self.model.cells, self.model.formulae):
+                for full_addr, entry in list(entries.items()):
+                    if full_addr.startswith(prefix):
+                        entries.setdefault(
+                            sys.intern(full_addr[prefix_len:]), entry)
 
     def read_and_parse_dict(
             self, input_dict, default_sheet="Sheet1", build_code=True):
-        for item in input_dict:
+        cells = self.model.cells
+        formulae = self.model.formulae
+        sheet_prefix = f"{default_sheet}!"
+        for item, value in input_dict.items():
             if "!" in item:
-                cell_address = item
+                cell_address = sys.intern(item)
             else:
-                cell_address = f"{default_sheet}!{item}"
+                cell_address = sys.intern(sheet_prefix + item)
 
             if (
-                    not isinstance(input_dict[item], (float, int))
-                    and input_dict[item][0] == '='
+                    not isinstance(value, (float, int))
+                    and value[0] == '='
             ):
                 formula = xltypes.XLFormula(
-                    input_dict[item],
+                    value,
                     sheet_name=default_sheet
                 )
                 cell = xltypes.XLCell(
                     cell_address, None,
                     formula=formula)
-                self.model.cells[cell_address] = cell
-                self.model.formulae[cell_address] = cell.formula
+                cells[cell_address] = cell
+                formulae[cell_address] = cell.formula
 
             else:
-                self.model.cells[cell_address] = xltypes.XLCell(
-                    cell_address, input_dict[item])
+                cells[cell_address] = xltypes.XLCell(cell_address, value)
 
         self.build_ranges(default_sheet=default_sheet)
 
@@ -311,51 +432,68 @@ class ModelCompiler:
                 raise ValueError(message)
 
     def build_ranges(self, default_sheet=None):
-        from .lazy_loading import create_excel_compliant_lazy_range, is_full_range
-        
-        for formula in self.model.formulae:
+        # Every distinct range is resolved, and its missing cells created,
+        # once per build no matter how many formulae reference it.
+        range_cells = {}
+        cells = self.model.cells
+        ranges = self.model.ranges
+        defined_names = self.model.defined_names
+
+        for formula, xlformula in self.model.formulae.items():
             associated_cells = set()
-            for range in self.model.formulae[formula].terms:
+            for range in xlformula.terms:
                 if ":" in range:
                     if "!" not in range:
                         range = f"{default_sheet}!{range}"
-                    
-                    # Use Excel-compliant lazy loading for full ranges
-                    if is_full_range(range):
-                        logging.info(f"Using Excel-compliant lazy loading for full range: {range}")
-                        self.model.ranges[range] = create_excel_compliant_lazy_range(range, self.model, range)
-                        # For lazy ranges, add actual cells based on Excel data
-                        lazy_range = self.model.ranges[range]
-                        for row in lazy_range.cells:
-                            for cell in row:
-                                associated_cells.add(cell)
-                    else:
-                        # Use standard XLRange for normal ranges
-                        self.model.ranges[range] = xltypes.XLRange(range, range)
-                        associated_cells.update([
-                            cell
-                            for row in self.model.ranges[range].cells
-                                for cell in row  # noqa: E131
-                        ])
+
+                    if range not in range_cells:
+                        range_cells[range] = self._build_range(range)
+                    associated_cells.update(range_cells[range])
                 else:
                     associated_cells.add(range)
 
-                if range in self.model.ranges:
-                    for row in self.model.ranges[range].cells:
-                        for cell_address in row:
-                            if cell_address not in self.model.cells.keys():
-                                self.model.cells[cell_address] = \
-                                    xltypes.XLCell(cell_address, '')
+                    if range in ranges:
+                        self._add_missing_range_cells(ranges[range])
 
-            if formula in self.model.cells:
-                self.model.cells[formula].formula.associated_cells = \
-                    associated_cells
+            cell = cells.get(formula)
+            if cell is not None:
+                cell.formula.associated_cells = associated_cells
 
-            if formula in self.model.defined_names:
-                self.model.defined_names[formula].formula.associated_cells = \
-                    associated_cells
+            defn = defined_names.get(formula)
+            if defn is not None:
+                defn.formula.associated_cells = associated_cells
 
-            self.model.formulae[formula].associated_cells = associated_cells
+            xlformula.associated_cells = associated_cells
+
+    def _build_range(self, address):
+        """Add the range at `address` to the model and return its cells."""
+        from .lazy_loading import (
+            create_excel_compliant_lazy_range, is_full_range)
+
+        # Use Excel-compliant lazy loading for full ranges
+        if is_full_range(address):
+            logging.info(
+                f"Using Excel-compliant lazy loading for full range: "
+                f"{address}")
+            xlrange = create_excel_compliant_lazy_range(
+                address, self.model, address)
+        else:
+            # Use standard XLRange for normal ranges
+            xlrange = xltypes.XLRange(address, address)
+
+        self.model.ranges[address] = xlrange
+        self._add_missing_range_cells(xlrange)
+        # A set, so formulae sharing the range merge it with the hashes
+        # already computed.
+        return frozenset(itertools.chain.from_iterable(xlrange.cells))
+
+    def _add_missing_range_cells(self, xlrange):
+        cells = self.model.cells
+        for row in xlrange.cells:
+            for cell_address in row:
+                if cell_address not in cells:
+                    cell = xltypes.XLCell(cell_address, '')
+                    cells[cell.address] = cell
 
     @staticmethod
     def extract(model, focus):
@@ -363,7 +501,7 @@ class ModelCompiler:
 
         for address in focus:
             if isinstance(address, str) and address in model.cells:
-                extracted_model.cells[address] = copy.deepcopy(
+                extracted_model.cells[address] = _copy_cell(
                     model.cells[address])
 
             elif isinstance(address, str) and address in model.defined_names:
@@ -372,28 +510,33 @@ class ModelCompiler:
                     model.defined_names[address])
 
                 if isinstance(defn, xltypes.XLCell):
-                    extracted_model.cells[defn.address] = copy.deepcopy(
+                    extracted_model.cells[defn.address] = _copy_cell(
                         model.cells[defn.address])
 
                 elif isinstance(defn, xltypes.XLRange):
                     for row in defn.cells:
                         for column in row:
-                            extracted_model.cells[column] = copy.deepcopy(
+                            extracted_model.cells[column] = _copy_cell(
                                 model.cells[column])
 
+        extracted_cells = extracted_model.cells
         terms_to_copy = []
-        for addr, cell in extracted_model.cells.items():
-            if cell.formula is not None:
-                for term in cell.formula.terms:
-                    if (term in extracted_model.cells
-                            and cell.formula != model.cells[addr].formula):
-                        cell.formula = copy.deepcopy(model.cells[addr].formula)
-
-                    elif term not in extracted_model.cells:
-                        terms_to_copy.append(term)
-
-        for term in terms_to_copy:
-            extracted_model.cells[term] = copy.deepcopy(model.cells[term])
+        for addr, cell in extracted_cells.items():
+            formula = cell.formula
+            if formula is None:
+                continue
+            # Compare with the original formula once per cell, not per term.
+            if any(term in extracted_cells for term in formula.terms):
+                original_formula = model.cells[addr].formula
+                if formula != original_formula:
+                    cell.formula = copy.copy(original_formula)
+            terms_to_copy.extend(
+                term for term in formula.terms
+                if term not in extracted_cells)
+
+        # Terms shared by several formulas are copied once.
+        for term in dict.fromkeys(terms_to_copy):
+            extracted_cells[term] = _copy_cell(model.cells[term])
 
         extracted_model.build_code()
 
@@ -1,4 +1,5 @@
 from . import ast_nodes, tokenizer
+from .range import is_full_column_or_row_reference
 
 
 class Operator(object):
@@ -317,22 +318,7 @@ class FormulaParser:
         Returns:
             True if it's a full column (A:A) or row (1:1) reference
         """
-        import re
-        
-        # Full column patterns: A:A, Sheet!A:A
-        column_patterns = [
-            r'^[A-Z]+:[A-Z]+$',                    # A:A, B:B
-            r'^[^!]+![A-Z]+:[A-Z]+$',             # Sheet!A:A
-        ]
-        
-        # Full row patterns: 1:1, Sheet!1:1  
-        row_patterns = [
-            r'^[0-9]+:[0-9]+$',                   # 1:1, 2:2
-            r'^[^!]+![0-9]+:[0-9]+$',            # Sheet!1:1
-        ]
-        
-        all_patterns = column_patterns + row_patterns
-        return any(re.match(pattern, ref_string) for pattern in all_patterns)
+        return is_full_column_or_row_reference(ref_string)
 
     def build_ast(self, nodes):
         """Update AST nodes to build a proper parse tree.
@@ -31,22 +31,29 @@ class WorksheetReader(openpyxl.worksheet._reader.WorksheetReader):
         self.tables = []
 
     def bind_cells(self):
+        ws = self.ws
+        cell_styles = ws.parent._cell_styles
+        ws_cells = ws._cells
+        max_row = 0
         for idx, row in self.parser.parse():
             for cell in row:
-                style = self.ws.parent._cell_styles[cell['style_id']]
+                if cell['row'] > max_row:
+                    max_row = cell['row']
+                style = cell_styles[cell['style_id']]
                 c = Cell(
-                    self.ws, row=cell['row'], column=cell['column'],
+                    ws, row=cell['row'], column=cell['column'],
                     style_array=style)
                 c._value = cell['value']
                 c.data_type = cell['data_type']
                 # xlcalculator extension: Store the cached value as well.
                 if c.data_type == 'f':
                     c.cvalue = cell['cvalue']
-                self.ws._cells[(cell['row'], cell['column'])] = c
+                ws_cells[(cell['row'], cell['column'])] = c
 
-        if self.ws._cells:
-            # use cells not row dimensions
-            self.ws._current_row = self.ws.max_row
+        if ws_cells:
+            # use cells not row dimensions; tracked while binding rather
+            # than through ws.max_row, which rescans every cell.
+            ws._current_row = max_row
 
 
 @contextlib.contextmanager
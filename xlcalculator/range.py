@@ -7,10 +7,13 @@ Provides dataclasses and utilities for robust Excel reference handling.
 """
 
 import collections
+import functools
 import re
 from dataclasses import dataclass
 from typing import Tuple, Optional, List, Union
-from openpyxl.utils.cell import COORD_RE, SHEET_TITLE, range_boundaries, get_column_letter, column_index_from_string
+from openpyxl.utils.cell import (
+    COORD_RE, SHEET_TITLE, column_index_from_string, get_column_letter,
+    range_boundaries)
 
 # Import Excel constants
 from .constants import EXCEL_MAX_COLUMNS, EXCEL_MAX_ROWS, EXCEL_MAX_COLUMN_INDEX
@@ -19,7 +22,30 @@ from .constants import EXCEL_MAX_COLUMNS, EXCEL_MAX_ROWS, EXCEL_MAX_COLUMN_INDEX
 MAX_COL = EXCEL_MAX_COLUMN_INDEX
 MAX_ROW = EXCEL_MAX_ROWS
 
+# Column letters indexed by 1-based column number (index 0 is unused).
+COLUMN_LETTERS = ('',) + tuple(
+    get_column_letter(col_idx) for col_idx in range(1, MAX_COL + 1))
+# 1-based column number by column letters, the inverse of COLUMN_LETTERS.
+COLUMN_INDEX = {
+    col_letter: col_idx
+    for col_idx, col_letter in enumerate(COLUMN_LETTERS) if col_letter}
 
+
+def column_index(col_letter: str) -> int:
+    """Convert column letters to a 1-based column number.
+    
+    Table lookup for upper-case letters; anything else is left to openpyxl,
+    which also raises ValueError for invalid columns.
+    """
+    try:
+        return COLUMN_INDEX[col_letter]
+    except KeyError:
+        return column_index_from_string(col_letter)
+
+
+# A workbook only has a handful of sheet names, resolved for every sheet
+# qualified reference.
+@functools.lru_cache(maxsize=1024)
 def resolve_sheet(sheet_str: str) -> str:
     """Resolve sheet name from sheet string, handling quoted names."""
     sheet_str = sheet_str.strip()
@@ -61,14 +87,7 @@ class CellReference:
             CellReference.parse('Sheet1!A1', 'Sheet2') -> CellReference(sheet='Sheet1', address='A1', is_sheet_explicit=True)
             CellReference.parse('A1', 'Sheet2') -> CellReference(sheet='Sheet2', address='A1', is_sheet_explicit=False)
         """
-        if '!' in ref:
-            # Explicit sheet reference
-            parts = ref.split('!', 1)
-            sheet = resolve_sheet(parts[0])
-            return cls(sheet=sheet, address=parts[1], is_sheet_explicit=True)
-        else:
-            # Implicit reference - use current sheet context
-            return cls(sheet=current_sheet, address=ref, is_sheet_explicit=False)
+        return _parse_cell_reference(cls, ref, current_sheet)
     
     def __str__(self) -> str:
         """Return full sheet!address format."""
@@ -83,6 +102,43 @@ class CellReference:
         return self.sheet, self.address
 
 
+# References are immutable and the same few recur across formulas and
+# evaluations, so their parses are shared.
+@functools.lru_cache(maxsize=65536)
+def _parse_cell_reference(cls, ref: str, current_sheet: str) -> CellReference:
+    sheet_str, sep, address = ref.partition('!')
+    if sep:
+        # Explicit sheet reference
+        sheet = resolve_sheet(sheet_str)
+        return cls(sheet=sheet, address=address, is_sheet_explicit=True)
+    else:
+        # Implicit reference - use current sheet context
+        return cls(sheet=current_sheet, address=ref, is_sheet_explicit=False)
+
+
+# Column (A:A) and row (1:1) references, capturing both ends.
+_COLUMN_REF_RE = re.compile(r'^([A-Z]+):([A-Z]+)$')
+_ROW_REF_RE = re.compile(r'^(\d+):(\d+)$')
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_a1(addr: str) -> Optional[Tuple[str, int]]:
+    """Split a plain local address like 'AB12' into ('AB', 12).
+    
+    Returns None for anything else (absolute markers, ranges, invalid
+    addresses), which is left to the general parser.
+    """
+    if not addr.isascii():
+        return None
+    idx = 0
+    length = len(addr)
+    while idx < length and addr[idx].isalpha():
+        idx += 1
+    if not 1 <= idx <= 3 or not addr[idx:].isdigit():
+        return None
+    return addr[:idx], int(addr[idx:])
+
+
 @dataclass(frozen=True)
 class ParsedAddress:
     """Represents a parsed cell address with column and row components.
@@ -111,37 +167,50 @@ class ParsedAddress:
         Raises:
             ValueError: If address format is invalid
         """
-        if '!' not in addr:
+        sheet_str, sep, addr_str = addr.partition('!')
+        if not sep:
             raise ValueError(f"Address must include sheet name: {addr}")
         
-        sheet_str, addr_str = addr.split('!', 1)
         sheet = resolve_sheet(sheet_str)
         
-        # Check for column reference (A:A)
-        if ':' in addr_str and re.match(r'^[A-Z]+:[A-Z]+$', addr_str):
-            # Column reference like A:A
-            col_parts = addr_str.split(':')
-            if col_parts[0] == col_parts[1]:
-                # Single column reference
-                return cls(sheet=sheet, column=col_parts[0], row=1, full_address=addr)
-            else:
-                raise ValueError(f"Multi-column ranges not supported yet: {addr_str}")
+        # Plain cell address like A1, by far the most common case
+        coordinates = _parse_a1(addr_str)
+        if coordinates is not None:
+            col, row = coordinates
+            return cls(sheet=sheet, column=col, row=row, full_address=addr)
         
-        # Check for row reference (1:1)
-        if ':' in addr_str and re.match(r'^\d+:\d+$', addr_str):
-            # Row reference like 1:1
-            row_parts = addr_str.split(':')
-            if row_parts[0] == row_parts[1]:
-                # Single row reference
-                return cls(sheet=sheet, column='A', row=int(row_parts[0]), full_address=addr)
-            else:
-                raise ValueError(f"Multi-row ranges not supported yet: {addr_str}")
+        if ':' in addr_str:
+            # Check for column reference (A:A)
+            col_match = _COLUMN_REF_RE.match(addr_str)
+            if col_match:
+                start_col, end_col = col_match.groups()
+                if start_col == end_col:
+                    # Single column reference
+                    return cls(
+                        sheet=sheet, column=start_col, row=1,
+                        full_address=addr)
+                else:
+                    raise ValueError(
+                        f"Multi-column ranges not supported yet: {addr_str}")
+            
+            # Check for row reference (1:1)
+            row_match = _ROW_REF_RE.match(addr_str)
+            if row_match:
+                start_row, end_row = row_match.groups()
+                if start_row == end_row:
+                    # Single row reference
+                    return cls(
+                        sheet=sheet, column='A', row=int(start_row),
+                        full_address=addr)
+                else:
+                    raise ValueError(
+                        f"Multi-row ranges not supported yet: {addr_str}")
         
-        coord_match = COORD_RE.split(addr_str)
-        if len(coord_match) < 3:
+        # Absolute addresses like $A$1
+        coord_match = COORD_RE.match(addr_str)
+        if coord_match is None:
             raise ValueError(f"Invalid address format: {addr_str}")
-        
-        col, row = coord_match[1:3]
+        col, row = coord_match.groups()
         return cls(sheet=sheet, column=col, row=int(row), full_address=addr)
     
     def __str__(self) -> str:
@@ -204,7 +273,7 @@ class RangeReference:
                 # Check for full column (A:A, B:B)
                 if left.isalpha() and right.isalpha() and left == right:
                     is_full_column = True
-                    min_col = max_col = column_index_from_string(left)
+                    min_col = max_col = column_index(left)
                     min_row = 1
                     max_row = MAX_ROW
                 
@@ -215,7 +284,16 @@ class RangeReference:
                     min_col = 1
                     max_col = MAX_COL
                 
-                # Regular range (A1:B2)
+                # Plain regular range (A1:B2), the common case. Bounds on
+                # row 0 are left to range_boundaries().
+                elif all(coordinates and coordinates[1]
+                         for coordinates in map(_parse_a1, (left, right))):
+                    (start_col, min_row), (end_col, max_row) = (
+                        _parse_a1(left), _parse_a1(right))
+                    min_col = column_index(start_col)
+                    max_col = column_index(end_col)
+                
+                # Other regular ranges ($A$1:B2, A1:B, ...)
                 else:
                     try:
                         min_col, min_row, max_col, max_row = range_boundaries(address)
@@ -227,16 +305,18 @@ class RangeReference:
                     except Exception:
                         # Fallback for invalid ranges
                         pass
+        elif _parse_a1(address):
+            # Plain single cell reference
+            col, min_row = _parse_a1(address)
+            max_row = min_row
+            min_col = max_col = column_index(col)
         else:
             # Single cell reference
-            try:
-                coord_match = COORD_RE.split(address)
-                if len(coord_match) >= 3:
-                    col, row = coord_match[1:3]
-                    min_col = max_col = column_index_from_string(col)
-                    min_row = max_row = int(row)
-            except Exception:
-                pass
+            coord_match = COORD_RE.match(address)
+            if coord_match is not None:
+                col, row = coord_match.groups()
+                min_col = max_col = column_index(col)
+                min_row = max_row = int(row)
         
         return cls(
             sheet=sheet,
@@ -268,6 +348,7 @@ class RangeReference:
 
 
 # Backward compatibility functions
+@functools.lru_cache(maxsize=65536)
 def parse_sheet_and_address(ref: str, default_sheet: str = 'Sheet1') -> Tuple[str, str]:
     """Parse reference into sheet name and address part.
     
@@ -309,6 +390,9 @@ def resolve_ranges(ranges: str, default_sheet: str = 'Sheet1') -> Tuple[str, Lis
     Returns:
         Tuple of (sheet_name, cell_matrix)
     """
+    if ',' not in ranges:
+        return _resolve_single_range(ranges, default_sheet)
+    
     sheet = None
     range_cells = collections.defaultdict(set)
     
@@ -336,13 +420,36 @@ def resolve_ranges(ranges: str, default_sheet: str = 'Sheet1') -> Tuple[str, Lis
     
     return sheet, [
         [
-            f'{sheet_str}{get_column_letter(col_idx)}{row_idx}'
+            f'{sheet_str}{COLUMN_LETTERS[col_idx]}{row_idx}'
             for col_idx in sorted(row_cells)
         ]
         for row_idx, row_cells in sorted(range_cells.items())
     ]
 
 
+def _resolve_single_range(
+        rng: str, default_sheet: str) -> Tuple[str, List[List[str]]]:
+    """Resolve a single rectangular range into sheet and cell matrix.
+    
+    Unlike the union of several ranges, the matrix is a plain rectangle, so
+    the column prefixes are formatted once and reused for every row.
+    """
+    range_ref = RangeReference.parse(rng.strip(), default_sheet)
+    sheet = range_ref.sheet if range_ref.sheet is not None else default_sheet
+    
+    if not (range_ref.min_col and range_ref.min_row
+            and range_ref.max_col and range_ref.max_row):
+        return sheet, []
+    
+    sheet_str = sheet + '!' if sheet else ''
+    col_letters = COLUMN_LETTERS[range_ref.min_col:range_ref.max_col + 1]
+    col_prefixes = [sheet_str + col_letter for col_letter in col_letters]
+    return sheet, [
+        [f'{col_prefix}{row_idx}' for col_prefix in col_prefixes]
+        for row_idx in range(range_ref.min_row, range_ref.max_row + 1)
+    ]
+
+
 def is_full_range(range_str: str) -> bool:
     """Check if a range reference is a full column/row that needs lazy loading.
     
@@ -352,11 +459,40 @@ def is_full_range(range_str: str) -> bool:
     Returns:
         True if this is a full column/row reference
     """
-    try:
-        range_ref = RangeReference.parse(range_str)
-        return range_ref.is_full_range()
-    except Exception:
+    # A:A or 1:1, optionally sheet qualified; no need to fully parse.
+    # Multi-area references (A1,B:B) are resolved as a whole.
+    if ',' in range_str:
+        return False
+    left, sep, right = range_str.rpartition('!')[2].partition(':')
+    if not sep or left != right or not left.isascii():
+        return False
+    return left.isdigit() or left.upper() in COLUMN_INDEX
+
+
+def is_full_column_or_row_reference(ref: str) -> bool:
+    """Check if a reference is a full column (A:A, A:B) or row (1:1, 1:2).
+    
+    Cheap string scan rather than a regex or full parse, as the parser
+    checks every range token with it.
+    
+    Args:
+        ref: Reference string, optionally sheet qualified
+        
+    Returns:
+        True if this is a full column or row reference
+    """
+    sheet, sep, address = ref.partition('!')
+    if not sep:
+        address = ref
+    elif not sheet or '!' in address:
+        return False
+    left, sep, right = address.partition(':')
+    if not sep or not (left.isascii() and right.isascii()):
         return False
+    return (
+        (left.isalpha() and left.isupper() and right.isalpha()
+         and right.isupper())
+        or (left.isdigit() and right.isdigit()))
 
 
 # Legacy aliases for backward compatibility
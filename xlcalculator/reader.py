@@ -1,3 +1,5 @@
+import sys
+
 import openpyxl
 
 from . import patch, xltypes
@@ -23,27 +25,28 @@ class Reader():
         cells = {}
         formulae = {}
         ranges = {}
+        intern = sys.intern
+        ArrayFormula = openpyxl.worksheet.formula.ArrayFormula
+        XLFormula = xltypes.XLFormula
+        XLCell = xltypes.XLCell
         for sheet_name in self.book.sheetnames:
             if sheet_name in ignore_sheets:
                 continue
             sheet = self.book[sheet_name]
+            prefix = f'{sheet_name}!'
             for cell in sheet._cells.values():
-                addr = f'{sheet_name}!{cell.coordinate}'
+                addr = intern(prefix + cell.coordinate)
                 if cell.data_type == 'f':
                     value = cell.value
-                    if isinstance(
-                            value,
-                            openpyxl.worksheet.formula.ArrayFormula
-                    ):
+                    if isinstance(value, ArrayFormula):
                         value = value.text
-                    formula = xltypes.XLFormula(value, sheet_name)
+                    formula = XLFormula(value, sheet_name)
                     formulae[addr] = formula
                     value = cell.cvalue
                 else:
                     formula = None
                     value = cell.value
 
-                cells[addr] = xltypes.XLCell(
-                    addr, value=value, formula=formula)
+                cells[addr] = XLCell(addr, value=value, formula=formula)
 
         return [cells, formulae, ranges]
@@ -13,6 +13,7 @@ from typing import Any, TYPE_CHECKING
 
 from .xlfunctions import xlerrors
 from .constants import EXCEL_MAX_ROWS, EXCEL_MAX_COLUMNS
+from .range import COLUMN_INDEX, COLUMN_LETTERS
 
 if TYPE_CHECKING:
     from .evaluator import Evaluator
@@ -208,6 +209,8 @@ class CellReference:
     @staticmethod
     def _column_to_letter(col_num: int) -> str:
         """Convert column number to Excel letter(s)."""
+        if 0 < col_num < len(COLUMN_LETTERS):
+            return COLUMN_LETTERS[col_num]
         result = ""
         while col_num > 0:
             col_num -= 1  # Make it 0-based
@@ -218,6 +221,9 @@ class CellReference:
     @staticmethod
     def _letter_to_column(letters: str) -> int:
         """Convert Excel column letter(s) to number."""
+        col_num = COLUMN_INDEX.get(letters)
+        if col_num is not None:
+            return col_num
         result = 0
         for char in letters.upper():
             result = result * 26 + (ord(char) - ord('A') + 1)
@@ -644,6 +650,8 @@ class FullColumnReference:
     @staticmethod
     def _column_to_letter(col_num: int) -> str:
         """Convert column number to Excel letter(s)."""
+        if 0 < col_num < len(COLUMN_LETTERS):
+            return COLUMN_LETTERS[col_num]
         result = ""
         while col_num > 0:
             col_num -= 1  # Make it 0-based
@@ -15,9 +15,24 @@ Architecture:
 - Excel-compatible error handling
 """
 
+import re
+
 from . import xl, xlerrors, func_xltypes
+from ..range import (
+    COLUMN_LETTERS, column_index, is_full_column_or_row_reference)
 from ..utils.decorators import require_context
 
+# Reference formats, matched without the optional "Sheet!" prefix unless
+# noted otherwise.
+_FULL_COLUMN_RE = re.compile(r'^[A-Z]+:[A-Z]+$')  # A:A, A:B
+_FULL_ROW_RE = re.compile(r'^[0-9]+:[0-9]+$')  # 1:1, 1:2
+_CELL_RE = re.compile(r'^([A-Z]+)([0-9]+)$')  # A1
+# Any cell, range, full column or full row reference, optionally sheet
+# qualified.
+_EXCEL_REFERENCE_RE = re.compile(
+    r'^(?:[^!]+!)?'
+    r'(?:[A-Z]+[0-9]+(?::[A-Z]+[0-9]+)?|[A-Z]+:[A-Z]+|[0-9]+:[0-9]+)$')
+
 # TEST: Simple function to verify registration works
 @xl.register()
 def TEST_FUNCTION():
@@ -206,8 +221,6 @@ def _build_offset_range(ref_string, rows_offset, cols_offset, height, width):
     Returns:
         Target range string (e.g., "Sheet!B2:C3")
     """
-    import re
-    
     # Parse the reference string manually to avoid evaluation issues
     if '!' in ref_string:
         sheet_name, cell_part = ref_string.split('!', 1)
@@ -219,11 +232,11 @@ def _build_offset_range(ref_string, rows_offset, cols_offset, height, width):
     # Handle different reference types
     if ':' in cell_part:
         # Handle column/row range references like A:A, 1:1
-        if re.match(r'^[A-Z]+:[A-Z]+$', cell_part):
+        if _FULL_COLUMN_RE.match(cell_part):
             # Column range like A:A - use first column and row 1 as base
             base_col_letter = cell_part.split(':')[0]
             base_row_num = 1
-        elif re.match(r'^\d+:\d+$', cell_part):
+        elif _FULL_ROW_RE.match(cell_part):
             # Row range like 1:1 - use column A and first row as base
             base_col_letter = 'A'
             base_row_num = int(cell_part.split(':')[0])
@@ -231,7 +244,7 @@ def _build_offset_range(ref_string, rows_offset, cols_offset, height, width):
             raise xlerrors.RefExcelError("Invalid range reference format")
     else:
         # Extract column and row from cell part (e.g., "A1" -> "A", 1)
-        match = re.match(r'^([A-Z]+)(\d+)$', cell_part)
+        match = _CELL_RE.match(cell_part)
         if not match:
             raise xlerrors.RefExcelError("Invalid cell reference format")
         
@@ -260,14 +273,14 @@ def _build_offset_range(ref_string, rows_offset, cols_offset, height, width):
 
 def _column_letter_to_number(col_letter):
     """Convert column letter to number (A=1, B=2, etc.)."""
-    from openpyxl.utils.cell import column_index_from_string
-    return column_index_from_string(col_letter)
+    return column_index(col_letter)
 
 
 def _number_to_column_letter(col_num):
     """Convert column number to letter (1=A, 2=B, etc.)."""
-    from openpyxl.utils.cell import get_column_letter
-    return get_column_letter(col_num)
+    if not 1 <= col_num < len(COLUMN_LETTERS):
+        raise ValueError(f"Invalid column index {col_num}")
+    return COLUMN_LETTERS[col_num]
 
 
 def _validate_offset_target_bounds(target_range, evaluator):
@@ -300,8 +313,6 @@ def _is_valid_excel_reference(ref_string):
     Returns:
         True if valid Excel reference format, False otherwise
     """
-    import re
-    
     # Handle empty or None strings
     if not ref_string or ref_string.strip() == "":
         return False
@@ -311,19 +322,8 @@ def _is_valid_excel_reference(ref_string):
     if ref_string in ["#REF!", "#VALUE!", "#NAME?", "#DIV/0!", "#N/A", "#NULL!", "#NUM!"]:
         return False
     
-    # Excel reference patterns
-    patterns = [
-        r'^[A-Z]+[0-9]+$',                           # A1, B2, etc.
-        r'^[A-Z]+[0-9]+:[A-Z]+[0-9]+$',              # A1:B2, etc.
-        r'^[^!]+![A-Z]+[0-9]+$',                     # Sheet!A1, etc.
-        r'^[^!]+![A-Z]+[0-9]+:[A-Z]+[0-9]+$',        # Sheet!A1:B2, etc.
-        r'^[A-Z]+:[A-Z]+$',                          # A:B (column range)
-        r'^[0-9]+:[0-9]+$',                          # 1:2 (row range)
-        r'^[^!]+![A-Z]+:[A-Z]+$',                    # Sheet!A:B
-        r'^[^!]+![0-9]+:[0-9]+$',                    # Sheet!1:2
-    ]
-    
-    return any(re.match(pattern, ref_string) for pattern in patterns)
+    # A1, A1:B2, A:B or 1:2, optionally sheet qualified
+    return _EXCEL_REFERENCE_RE.match(ref_string) is not None
 
 
 def _validate_sheet_exists(ref_string, evaluator):
@@ -413,22 +413,7 @@ def _is_full_column_or_row_reference(ref_string):
     Returns:
         True if it's a full column (A:A) or row (1:1) reference
     """
-    import re
-    
-    # Full column patterns: A:A, Sheet!A:A
-    column_patterns = [
-        r'^[A-Z]+:[A-Z]+$',                    # A:A, B:B
-        r'^[^!]+![A-Z]+:[A-Z]+$',             # Sheet!A:A
-    ]
-    
-    # Full row patterns: 1:1, Sheet!1:1  
-    row_patterns = [
-        r'^[0-9]+:[0-9]+$',                   # 1:1, 2:2
-        r'^[^!]+![0-9]+:[0-9]+$',            # Sheet!1:1
-    ]
-    
-    all_patterns = column_patterns + row_patterns
-    return any(re.match(pattern, ref_string) for pattern in all_patterns)
+    return is_full_column_or_row_reference(ref_string)
 
 
 def _parse_full_reference_to_cell(ref_string):
@@ -440,7 +425,6 @@ def _parse_full_reference_to_cell(ref_string):
     Returns:
         CellReference object for the starting cell
     """
-    import re
     from ..references import CellReference
     
     # Parse sheet and reference parts
@@ -451,14 +435,14 @@ def _parse_full_reference_to_cell(ref_string):
         ref_part = ref_string
     
     # Handle full column references (A:A, B:B)
-    if re.match(r'^[A-Z]+:[A-Z]+$', ref_part):
+    if _FULL_COLUMN_RE.match(ref_part):
         column = ref_part.split(':')[0]  # Get first column (A from A:A)
         # Full column starts at row 1
         cell_addr = f"{sheet_name}!{column}1" if sheet_name else f"{column}1"
         return CellReference.parse(cell_addr)
     
     # Handle full row references (1:1, 2:2)
-    elif re.match(r'^[0-9]+:[0-9]+$', ref_part):
+    elif _FULL_ROW_RE.match(ref_part):
         row = ref_part.split(':')[0]  # Get first row (1 from 1:1)
         # Full row starts at column A
         cell_addr = f"{sheet_name}!A{row}" if sheet_name else f"A{row}"
@@ -521,42 +505,13 @@ def _handle_full_column_row_reference(ref_string, evaluator):
     else:
         # Excel behavior: References without sheet context require current sheet
         raise xlerrors.RefExcelError("Reference requires sheet context")
-        range_part = ref_string
     
-    # Check if it's a column reference (contains letters)
-    if any(c.isalpha() for c in range_part):
-        # Column reference like A:A or B:B
-        column_letter = range_part.split(':')[0]  # Get the column letter (A, B, etc.)
-        
-        # Find all cells in this column for the specified sheet
-        column_data = []
-        for cell_addr, cell in evaluator.model.cells.items():
-            # Parse cell address to check if it's in the target sheet and column
-            if cell_addr.startswith(f'{sheet_part}!{column_letter}'):
-                # Extract row number
-                row_part = cell_addr.split(f'{sheet_part}!{column_letter}')[1]
-                if row_part.isdigit():
-                    row_num = int(row_part)
-                    # Ensure we have enough slots in column_data
-                    while len(column_data) < row_num:
-                        column_data.append([None])
-                    column_data[row_num - 1] = [cell.value]
-        
-        # Remove None entries and return as Array
-        filtered_data = [[item[0]] for item in column_data if item[0] is not None]
-        return func_xltypes.Array(filtered_data)
-    else:
-        # Row reference like 1:1
-        row_number = range_part.split(':')[0]  # Get the row number
-        
-        # Find all cells in this row for the specified sheet
-        row_data = []
-        for cell_addr, cell in evaluator.model.cells.items():
-            if cell_addr.startswith(f'{sheet_part}!') and cell_addr.endswith(row_number):
-                # This is a cell in the target row
-                row_data.append(cell.value)
-        
-        return func_xltypes.Array([row_data])
+    # Only the first column (A of A:B) or row (1 of 1:2) is read. The
+    # evaluator looks it up in the model's cell index rather than scanning
+    # every cell.
+    first = range_part.split(':')[0]
+    return func_xltypes.Array(
+        evaluator.get_range_values(f'{sheet_part}!{first}:{first}'))
 
 
 def _handle_full_column_row_reference_for_index(ref_string, evaluator):
@@ -569,8 +524,6 @@ def _handle_full_column_row_reference_for_index(ref_string, evaluator):
     Returns:
         2D array data suitable for INDEX function processing
     """
-    import re
-    
     # Parse sheet and reference parts
     if '!' in ref_string:
         sheet_name, ref_part = ref_string.split('!', 1)
@@ -579,7 +532,7 @@ def _handle_full_column_row_reference_for_index(ref_string, evaluator):
         ref_part = ref_string
     
     # Check if it's a column reference (contains letters)
-    if re.match(r'^[A-Z]+:[A-Z]+$', ref_part):
+    if _FULL_COLUMN_RE.match(ref_part):
         # Column reference like A:A or B:B
         from ..references import FullColumnReference
         try:
@@ -593,7 +546,7 @@ def _handle_full_column_row_reference_for_index(ref_string, evaluator):
             return range_data if range_data else [[]]
     
     # Check if it's a row reference (contains only numbers)
-    elif re.match(r'^[0-9]+:[0-9]+$', ref_part):
+    elif _FULL_ROW_RE.match(ref_part):
         # Row reference like 1:1
         from ..references import FullRowReference
         try:
@@ -1231,8 +1184,6 @@ def COLUMN(reference: func_xltypes.XlAnything = None, *, _context=None) -> func_
     https://support.microsoft.com/en-us/office/
         column-function-44e8c754-711c-4df3-9da4-47a55042554b
     """
-    import re
-    
     if reference is None:
         # Return column number of current cell - use context injection
         if _context is not None:
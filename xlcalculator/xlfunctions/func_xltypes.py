@@ -7,11 +7,17 @@ from typing import Optional, Union, NewType
 from . import utils, xlerrors
 
 NATIVE_TO_XLTYPE = {}
+# Values ExcelType.cast_from_native() returns unchanged: Excel errors and
+# instances of any registered Excel type.
+_CAST_PASSTHROUGH_TYPES = (xlerrors.ExcelError,)
 
 
 def register(cls):
+    global _CAST_PASSTHROUGH_TYPES
     for native_type in cls.native_types:
         NATIVE_TO_XLTYPE[native_type] = cls
+    _CAST_PASSTHROUGH_TYPES = (xlerrors.ExcelError,) + tuple(
+        dict.fromkeys(NATIVE_TO_XLTYPE.values()))
     return cls
 
 
@@ -46,9 +52,11 @@ class ExcelType:
 
     @classmethod
     def cast_from_native(cls, value):
-        if isinstance(value, xlerrors.ExcelError):
-            return value
-        if isinstance(value, tuple(NATIVE_TO_XLTYPE.values())):
+        # Native values dispatch on their exact type with one dict lookup.
+        xltype = NATIVE_TO_XLTYPE.get(type(value))
+        if xltype is not None:
+            return xltype(value)
+        if isinstance(value, _CAST_PASSTHROUGH_TYPES):
             return value
         return NATIVE_TO_XLTYPE[type(value)](value)
 
@@ -1,19 +1,24 @@
 """Representation of a Microsoft Excel formula
 """
+import sys
 from dataclasses import dataclass, field
-from openpyxl.utils.cell import column_index_from_string
 from typing import List
 
 from . import ast_nodes, tokenizer
 from . import range as range_utils
 from .tokenizer import ExcelParserTokens
 
+# (column, row, column_index) keyed on the sheet-less part of a cell
+# address. The same local addresses ("A1", "B2", ...) repeat on every
+# sheet, so a workbook load parses each of them only once.
+_CELL_COORDINATES = {}
+
 
 class XLType:
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class XLFormula(XLType):
     """Representing an Excel Formula"""
 
@@ -41,10 +46,10 @@ class XLFormula(XLType):
                 term = token.tvalue
                 if '!' not in term:
                     term = f'{self.sheet_name}!{term}'
-                self.terms.append(term)
+                self.terms.append(sys.intern(term))
 
 
-@dataclass
+@dataclass(slots=True)
 class XLCell(XLType):
     """Excel Cell"""
 
@@ -62,13 +67,20 @@ class XLCell(XLType):
     defined_names: list = field(compare=False, default_factory=list, repr=True)
 
     def __post_init__(self):
-        from .range import ParsedAddress
-        parsed = ParsedAddress.parse(self.address)
-        self.sheet = parsed.sheet
-        self.column = parsed.column
-        self.row = str(parsed.row)
-        self.column_index = column_index_from_string(self.column)
-        self.row_index = parsed.row
+        from .range import ParsedAddress, column_index, resolve_sheet
+        # Cell addresses key every model dict; interned, lookups with the
+        # cell's own address succeed on identity.
+        self.address = sys.intern(self.address)
+        sheet, _, local_address = self.address.partition('!')
+        coordinates = _CELL_COORDINATES.get(local_address)
+        if coordinates is None:
+            parsed = ParsedAddress.parse(self.address)
+            coordinates = _CELL_COORDINATES[local_address] = (
+                parsed.column, parsed.row,
+                column_index(parsed.column))
+        self.sheet = resolve_sheet(sheet)
+        self.column, self.row_index, self.column_index = coordinates
+        self.row = str(self.row_index)
 
     def __float__(self):
         return float(self.value)
@@ -78,7 +90,7 @@ class XLCell(XLType):
         return hash((self.sheet, self.row_index, self.column_index))
 
 
-@dataclass
+@dataclass(slots=True)
 class XLRange(XLType):
     """Excel Range"""
 
@@ -93,7 +105,11 @@ class XLRange(XLType):
         if self.name is None:
             self.name = self.address_str
         from .range import resolve_ranges
-        self.sheet, self.cells = resolve_ranges(self.address_str)
+        self.sheet, cells = resolve_ranges(self.address_str)
+        # Interned like cell addresses, so looking the cells up in the model
+        # succeeds on identity.
+        self.cells = [
+            [sys.intern(address) for address in row] for row in cells]
 
     @property
     def address(self):